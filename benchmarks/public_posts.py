@@ -0,0 +1,129 @@
+"""
+Benchmarks the query behind PostManager.public() -- as issued by PostListView
+and PostFeed -- against the tumblelog_post table, before and after adding the
+composite (status, date_published) index created by migration 0004.
+
+Runs against an on-disk SQLite database built from the tumblelog_post schema,
+so it needs neither Django nor a configured project:
+
+    python benchmarks/public_posts.py --posts 1000000
+
+The query plan and the best of several timings are printed for the first
+page, a deep page, and the paginator's COUNT(*).
+"""
+import optparse
+import os
+import random
+import sqlite3
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+SCHEMA = """
+CREATE TABLE tumblelog_post (
+    id integer NOT NULL PRIMARY KEY,
+    status varchar(1) NOT NULL,
+    date_added datetime NOT NULL,
+    date_modified datetime NOT NULL,
+    date_published datetime NULL,
+    post_type_id integer NOT NULL,
+    object_id bigint NOT NULL,
+    author_id integer NULL,
+    slug varchar(64) NOT NULL UNIQUE
+);
+CREATE INDEX tumblelog_post_post_type_id ON tumblelog_post (post_type_id);
+CREATE INDEX tumblelog_post_author_id ON tumblelog_post (author_id);
+"""
+
+INDEX = """
+CREATE INDEX tumblelog_post_status_date_published
+    ON tumblelog_post (status, date_published);
+"""
+
+COLUMNS = ('id, status, date_added, date_modified, date_published, '
+    'post_type_id, object_id, author_id, slug')
+
+QUERIES = (
+    ('first page', (
+        'SELECT %s FROM tumblelog_post WHERE (status = ? AND '
+        'date_published <= ?) ORDER BY date_published DESC LIMIT 10'
+    ) % COLUMNS),
+    ('page 5000', (
+        'SELECT %s FROM tumblelog_post WHERE (status = ? AND '
+        'date_published <= ?) ORDER BY date_published DESC LIMIT 10 '
+        'OFFSET 49990'
+    ) % COLUMNS),
+    ('count', (
+        'SELECT COUNT(*) FROM tumblelog_post WHERE (status = ? AND '
+        'date_published <= ?)'
+    )),
+)
+
+
+def populate(conn, posts):
+    "Inserts posts spread over ten years, 90% published, 1% queued"
+    now = datetime.now()
+    random.seed(0)
+
+    def rows():
+        for i in range(1, posts + 1):
+            published = now - timedelta(minutes=random.randint(-52560, 5256000))
+            status = random.random() < 0.9 and 'p' or 'd'
+            stamp = published.strftime('%Y-%m-%d %H:%M:%S')
+            yield (i, status, stamp, stamp, stamp, random.randint(1, 14), i,
+                1, 'post-%d' % i)
+
+    conn.executemany(
+        'INSERT INTO tumblelog_post VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+        rows()
+    )
+    conn.commit()
+
+
+def measure(conn, label, sql, repeat):
+    params = ('p', datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+    plan = conn.execute('EXPLAIN QUERY PLAN ' + sql, params).fetchall()
+    timings = []
+    for i in range(repeat):
+        started = time.time()
+        conn.execute(sql, params).fetchall()
+        timings.append(time.time() - started)
+    print('  %s: %.2f ms' % (label, min(timings) * 1000))
+    for row in plan:
+        print('      %s' % row[-1])
+
+
+def main():
+    parser = optparse.OptionParser()
+    parser.add_option('--posts', type='int', default=1000000)
+    parser.add_option('--repeat', type='int', default=5)
+    options, args = parser.parse_args()
+
+    handle, path = tempfile.mkstemp(suffix='.sqlite3')
+    os.close(handle)
+    try:
+        conn = sqlite3.connect(path)
+        conn.executescript(SCHEMA)
+        started = time.time()
+        populate(conn, options.posts)
+        print('Inserted %d posts in %.1fs' % (options.posts,
+            time.time() - started))
+        conn.execute('ANALYZE')
+
+        print('Before:')
+        for label, sql in QUERIES:
+            measure(conn, label, sql, options.repeat)
+
+        conn.executescript(INDEX)
+        conn.execute('ANALYZE')
+
+        print('After:')
+        for label, sql in QUERIES:
+            measure(conn, label, sql, options.repeat)
+        conn.close()
+    finally:
+        os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
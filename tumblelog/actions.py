@@ -1,17 +1,46 @@
+from datetime import datetime
+
+from django.contrib.contenttypes.models import ContentType
 from django.utils.translation import ugettext as _
 
+from tumblelog.signals import posts_updated
+from tumblelog.util import atomic
+
+
+def update_posts(queryset, **values):
+    """
+    Applies the passed values to each post type object in the queryset and to
+    their Post objects, with a single UPDATE statement for each table, then
+    sends the posts_updated signal once. No per-object save() is performed, so
+    no oEmbed requests are made. Returns the number of objects updated.
+    """
+    # Imported here, as the post type modules import this module while their
+    # classes are defined
+    from tumblelog.models.base import Post
+    model = queryset.model
+    object_ids = list(queryset.values_list('pk', flat=True))
+    if not object_ids:
+        return 0
+
+    values['date_modified'] = datetime.now()
+    content_type = ContentType.objects.get_for_model(model)
+    with atomic():
+        model._default_manager.filter(pk__in=object_ids).update(**values)
+        Post.objects.filter(post_type=content_type, \
+            object_id__in=object_ids).update(**values)
+    posts_updated.send(sender=model, object_ids=object_ids, values=values)
+    return len(object_ids)
+
 
 def mark_as_published(self, request, queryset):
     "Admin action to mark posts as published"
-    for post in queryset:
-        post.status = 'p'
-        post.save()
+    count = update_posts(queryset, status='p')
+    self.message_user(request, _('%d post(s) marked as published.') % count)
 mark_as_published.short_description = _('Mark selected posts as published')
 
 
 def mark_as_draft(self, request, queryset):
     "Admin action to mark posts as draft"
-    for post in queryset:
-        post.status = 'd'
-        post.save()
+    count = update_posts(queryset, status='d')
+    self.message_user(request, _('%d post(s) marked as draft.') % count)
 mark_as_draft.short_description = _('Mark selected posts as draft')
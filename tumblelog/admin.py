@@ -2,6 +2,7 @@ from copy import deepcopy
 
 from django.contrib import admin
 
+from tumblelog.models.base import TumblelogMeta
 from tumblelog.settings import EDIT_META, POST_TYPES, USE_TAGGIT
 from tumblelog.util import import_model
 
@@ -88,7 +89,8 @@ for post_type in POST_TYPES:
     admin_cls = type(
         PostTypeAdmin.__name__,
         (PostTypeAdmin,),
-        dict((k, v,) for k, v in model._tumblelog_meta if not k.startswith('_'))
+        dict((k, v,) for k, v in model._tumblelog_meta if not \
+            k.startswith('_') and k not in TumblelogMeta.post_type_options)
     )
 
     # Slightly hacky; add taggit manager to the meta fieldset for all the
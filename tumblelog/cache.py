@@ -0,0 +1,309 @@
+import hashlib
+import time
+from datetime import datetime
+from functools import wraps
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.utils.decorators import available_attrs
+from django.utils.safestring import mark_safe
+
+from tumblelog.managers import attach_post_types
+from tumblelog.settings import CACHE_PAGES, FRAGMENT_CACHE_TIMEOUT, \
+    OEMBED_DEFAULT_CACHE_AGE, OEMBED_FAILURE_TIMEOUT, PAGE_CACHE_GRACE, \
+    PAGE_CACHE_TIMEOUT, USE_SNAPSHOTS
+from tumblelog.signals import posts_updated
+
+OEMBED_RESPONSE_PREFIX = 'tumblelog:oembed:response'
+OEMBED_FAILURE_PREFIX = 'tumblelog:oembed:failure'
+FRAGMENT_PREFIX = 'tumblelog:fragment'
+FRAGMENT_MODES = ('list', 'detail', 'rss')
+GENERATION_KEY = 'tumblelog:generation'
+GENERATION_TIMEOUT = 60 * 60 * 24 * 30
+CHANGED_KEY = 'tumblelog:changed'
+PAGE_PREFIX = 'tumblelog:page'
+VALIDATOR_PREFIX = 'tumblelog:validator'
+PAGE_LOCK_TIMEOUT = 30
+PAGE_LOCK_WAIT = 2
+PAGE_LOCK_POLL = 0.05
+
+
+def oembed_cache_key(endpoint, resource, params):
+    """
+    Returns the cache key for the provider response to a resource, taking into
+    account the endpoint and each parameter sent to it.
+    """
+    params = sorted((unicode(k), unicode(v)) for k, v in params.items())
+    raw = repr((unicode(endpoint), unicode(resource), params))
+    digest = hashlib.md5(raw.encode('utf-8')).hexdigest()
+    return '%s:%s' % (OEMBED_RESPONSE_PREFIX, digest)
+
+
+def oembed_cache_timeout(response):
+    """
+    Returns the number of seconds a provider response may be cached, honoring
+    its cache_age property where provided.
+    """
+    try:
+        return int(response['cache_age'])
+    except (KeyError, TypeError, ValueError):
+        return OEMBED_DEFAULT_CACHE_AGE
+
+
+def get_oembed_response(key):
+    "Returns the cached provider response for the key, or None"
+    return cache.get(key)
+
+
+def set_oembed_response(key, response):
+    "Caches a provider response for as long as its cache_age permits"
+    cache.set(key, response, oembed_cache_timeout(response))
+
+
+def oembed_failed(key):
+    """
+    Boolean indicating whether fetching the response for the key failed
+    within the last TUMBLELOG_OEMBED_FAILURE_TIMEOUT seconds.
+    """
+    return cache.get('%s:%s' % (OEMBED_FAILURE_PREFIX, key)) is not None
+
+
+def set_oembed_failure(key):
+    "Records that fetching the response for the key failed"
+    cache.set('%s:%s' % (OEMBED_FAILURE_PREFIX, key), True, \
+        OEMBED_FAILURE_TIMEOUT)
+
+
+def fragment_cache_key(post_type_id, object_id, date_modified, mode):
+    """
+    Returns the cache key for a post rendered in the passed mode (one of
+    FRAGMENT_MODES). Posts are identified by their post type and object id, so
+    that the key may be built from either a Post or its post type object, and
+    versioned by their modification date, so that a modified post is never
+    served from the cache.
+    """
+    return '%s:%s:%s:%s:%s' % (
+        FRAGMENT_PREFIX,
+        mode,
+        post_type_id,
+        object_id,
+        date_modified.strftime('%Y%m%d%H%M%S%f'),
+    )
+
+
+def post_fragment_key(post, mode):
+    "Returns the fragment cache key for a Post rendered in the passed mode"
+    return fragment_cache_key(post.post_type_id, post.object_id, \
+        post.date_modified, mode)
+
+
+def get_fragments(posts, mode, render):
+    """
+    Returns a list of the passed Post objects, each rendered in the passed
+    mode. Cached fragments are fetched with a single get_many(). The post type
+    objects of the remaining posts are then attached in bulk, and each is
+    rendered with render(post) and cached with a single set_many().
+    """
+    keys = [post_fragment_key(post, mode) for post in posts]
+    fragments = cache.get_many(keys)
+    missing = [post for post, key in zip(posts, keys) if key not in fragments]
+    if missing:
+        attach_post_types(missing[0].__class__, missing, USE_SNAPSHOTS)
+        rendered = dict((post_fragment_key(post, mode), render(post)) for \
+            post in missing)
+        cache.set_many(rendered, FRAGMENT_CACHE_TIMEOUT)
+        fragments.update(rendered)
+    return [mark_safe(fragments[key]) for key in keys]
+
+
+def object_fragment_keys(obj):
+    """
+    Returns the fragment cache keys of a post type object, in every mode, as
+    of its current modification date.
+    """
+    if not (obj.pk and obj.date_modified):
+        return []
+    post_type_id = ContentType.objects.get_for_model(obj).id
+    return [fragment_cache_key(post_type_id, obj.pk, obj.date_modified, \
+        mode) for mode in FRAGMENT_MODES]
+
+
+def delete_fragments(obj):
+    """
+    Deletes the cached fragments of a post type object, in every mode, as of
+    its current modification date.
+    """
+    keys = object_fragment_keys(obj)
+    if keys:
+        cache.delete_many(keys)
+
+
+def initial_generation():
+    """
+    Returns the generation used when none is cached. It is derived from the
+    clock, so that if the counter is evicted, the new generation is still
+    greater than any used before it.
+    """
+    return int(time.time() * 1000)
+
+
+def get_generation():
+    """
+    Returns the current cache generation, shared by every node using the same
+    cache backend. Cached pages are keyed on it, so incrementing it with
+    bump_generation() invalidates all of them at once.
+    """
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        cache.add(GENERATION_KEY, initial_generation(), GENERATION_TIMEOUT)
+        generation = cache.get(GENERATION_KEY) or initial_generation()
+    return generation
+
+
+def get_last_changed():
+    """
+    Returns the time at which the cache generation was last bumped. If none
+    is cached, the current time is stored, so that it never moves backwards.
+    """
+    changed = cache.get(CHANGED_KEY)
+    if changed is None:
+        cache.add(CHANGED_KEY, datetime.now(), GENERATION_TIMEOUT)
+        changed = cache.get(CHANGED_KEY) or datetime.now()
+    return changed
+
+
+def bump_generation():
+    """
+    Invalidates every cached page by incrementing the cache generation, and
+    records the time at which it was bumped.
+    """
+    cache.set(CHANGED_KEY, datetime.now(), GENERATION_TIMEOUT)
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        cache.set(GENERATION_KEY, initial_generation(), GENERATION_TIMEOUT)
+
+
+def bump_generation_on_update(sender, **kwargs):
+    bump_generation()
+posts_updated.connect(bump_generation_on_update, \
+    dispatch_uid='tumblelog.cache.bump_generation_on_update')
+
+
+def page_cache_key(request, generation):
+    "Returns the cache key for the page at the request's host and path"
+    raw = u'%s%s' % (request.get_host(), request.get_full_path())
+    digest = hashlib.md5(raw.encode('utf-8')).hexdigest()
+    return '%s:%s:%s' % (PAGE_PREFIX, generation, digest)
+
+
+def page_cache_timeout(now=None):
+    """
+    Returns the number of seconds a page may be cached: at most
+    TUMBLELOG_PAGE_CACHE_TIMEOUT, and never beyond the publication date of the
+    next scheduled post, when cached lists and feeds would become stale.
+    """
+    from tumblelog.models.base import Post
+    now = now or datetime.now()
+    timeout = PAGE_CACHE_TIMEOUT
+    upcoming = Post.objects.queued().filter(status='p') \
+        .order_by('date_published').values_list('date_published', flat=True)
+    for date_published in upcoming[:1]:
+        delta = date_published - now
+        seconds = delta.days * 86400 + delta.seconds + 1
+        timeout = max(1, min(timeout, seconds))
+    return timeout
+
+
+def get_list_validator():
+    """
+    Returns a dictionary of the cache generation, the time it was last
+    bumped, and the latest publication date of any public post, from which
+    the listing views and feeds are validated. Within a generation, the
+    public posts only change when a scheduled post is published, so the
+    dictionary is cached per generation until then, and is usually found
+    without a query.
+    """
+    from tumblelog.models.base import Post
+    generation = get_generation()
+    key = '%s:%s' % (VALIDATOR_PREFIX, generation)
+    validator = cache.get(key)
+    if validator is None:
+        published = Post.objects.public().order_by('-date_published') \
+            .values_list('date_published', flat=True)[:1]
+        validator = {
+            'generation': generation,
+            'date_changed': get_last_changed(),
+            'date_published': published and published[0] or None,
+        }
+        cache.set(key, validator, page_cache_timeout())
+    return validator
+
+
+def wait_for_page(key):
+    """
+    Polls the cache for up to PAGE_LOCK_WAIT seconds for the page another
+    request is rendering, returning its entry, or None if it did not appear.
+    """
+    deadline = time.time() + PAGE_LOCK_WAIT
+    while time.time() < deadline:
+        time.sleep(PAGE_LOCK_POLL)
+        entry = cache.get(key)
+        if entry is not None:
+            return entry
+    return None
+
+
+def cache_page(view):
+    """
+    Decorator caching the responses of a tumblelog view, with
+    TUMBLELOG_CACHE_PAGES enabled. Pages are cached until the cache generation
+    is bumped by a change to any post, or until the next scheduled post is
+    published.
+
+    Only one request at a time renders a missing or expired page. Expired
+    pages are kept for TUMBLELOG_PAGE_CACHE_GRACE seconds longer, and while a
+    page is rendered, concurrent requests for it are served the expired copy.
+    When there is none, e.g. just after the generation was bumped, they are
+    served the copy cached under the previous generation, which each page
+    keeps a pointer to; failing that, they briefly wait for the page to be
+    cached before rendering it themselves.
+    """
+    @wraps(view, assigned=available_attrs(view))
+    def cached_view(request, *args, **kwargs):
+        if not CACHE_PAGES or request.method not in ('GET', 'HEAD'):
+            return view(request, *args, **kwargs)
+
+        generation = get_generation()
+        key = page_cache_key(request, generation)
+        lock_key = '%s:lock' % key
+        latest_key = page_cache_key(request, 'latest')
+        entry = cache.get(key)
+        if entry is not None and time.time() < entry[0]:
+            return entry[1]
+        locked = cache.add(lock_key, True, PAGE_LOCK_TIMEOUT)
+        if not locked:
+            if entry is None:
+                previous = cache.get(latest_key)
+                if previous is not None and previous != generation:
+                    entry = cache.get(page_cache_key(request, previous))
+            if entry is None:
+                entry = wait_for_page(key)
+            if entry is not None:
+                return entry[1]
+
+        try:
+            response = view(request, *args, **kwargs)
+            if hasattr(response, 'render') and callable(response.render):
+                response = response.render()
+            if response.status_code == 200 and not response.cookies:
+                timeout = page_cache_timeout()
+                cache.set_many({
+                    key: (time.time() + timeout, response),
+                    latest_key: generation,
+                }, timeout + PAGE_CACHE_GRACE)
+        finally:
+            if locked:
+                cache.delete(lock_key)
+        return response
+    return cached_view
@@ -1,9 +1,108 @@
 from django.contrib.syndication.views import Feed
-from django.template.defaultfilters import slugify
+from django.core.cache import cache
 from django.template.loader import render_to_string
+from django.utils import simplejson
+from django.utils.feedgenerator import Atom1Feed, SyndicationFeed, \
+    rfc3339_date
 
+from tumblelog.cache import get_fragments, get_generation, page_cache_timeout
 from tumblelog.models import Post
-from tumblelog.settings import RSS_TITLE, RSS_LINK, RSS_DESCRIPTION, RSS_NUM
+from tumblelog.settings import CACHE_FRAGMENTS, RSS_TITLE, RSS_LINK, \
+    RSS_DESCRIPTION, RSS_NUM, USE_SNAPSHOTS
+
+FEED_ITEMS_PREFIX = 'tumblelog:feed:items'
+
+
+def render_description(post):
+    return render_to_string(post.fields.rss_template, {
+        'post': post,
+        'obj': post,
+        'post_type': post.fields.post_type_name,
+        'list_view': False,
+        'detail_view': True,
+    })
+
+
+def author_name(post):
+    if post.author is None:
+        return None
+    if post.author.first_name or post.author.last_name:
+        return '%s %s' % (post.author.first_name, post.author.last_name,)
+    return post.author.username
+
+
+def build_feed_items():
+    """
+    Returns a list of dictionaries holding the title, link, rendered
+    description, author and publication date of the latest public posts. Their
+    authors and post type objects are loaded in bulk, and their descriptions
+    are rendered from the fragment cache with TUMBLELOG_CACHE_FRAGMENTS
+    enabled.
+    """
+    posts = Post.objects.public().select_related('author')
+    if USE_SNAPSHOTS:
+        posts = posts.select_snapshot()
+    else:
+        posts = posts.select_generic_related()
+    posts = list(posts[:RSS_NUM])
+    if CACHE_FRAGMENTS:
+        descriptions = get_fragments(posts, 'rss', render_description)
+    else:
+        descriptions = [render_description(post) for post in posts]
+    return [{
+        'title': post.fields.title,
+        'link': post.get_absolute_url(),
+        'description': description,
+        'author_name': author_name(post),
+        'author_email': post.author and post.author.email or '',
+        'pubdate': post.date_published,
+    } for post, description in zip(posts, descriptions)]
+
+
+def feed_items():
+    """
+    Returns the items shared by every feed format. They are built once per
+    cache generation, so posts are only loaded and rendered again after a post
+    changes or a scheduled post is published.
+    """
+    key = '%s:%s' % (FEED_ITEMS_PREFIX, get_generation())
+    items = cache.get(key)
+    if items is None:
+        items = build_feed_items()
+        cache.set(key, items, page_cache_timeout())
+    return items
+
+
+class JSONFeedGenerator(SyndicationFeed):
+    """
+    Feed generator for JSON Feed version 1 (https://jsonfeed.org/version/1).
+    """
+    mime_type = 'application/json; charset=utf-8'
+
+    def write(self, outfile, encoding):
+        feed = {
+            'version': 'https://jsonfeed.org/version/1',
+            'title': self.feed['title'],
+            'home_page_url': self.feed['link'],
+            'description': self.feed['description'],
+            'items': [self.item(item) for item in self.items],
+        }
+        if self.feed.get('feed_url'):
+            feed['feed_url'] = self.feed['feed_url']
+        outfile.write(simplejson.dumps(feed))
+
+    def item(self, item):
+        data = {
+            'id': item['unique_id'] or item['link'],
+            'url': item['link'],
+            'title': item['title'],
+            'content_html': item['description'],
+        }
+        if item['pubdate'] is not None:
+            data['date_published'] = rfc3339_date(item['pubdate'])
+        if item['author_name'] is not None:
+            data['author'] = {'name': item['author_name']}
+        return data
 
 
 class PostFeed(Feed):
@@ -15,33 +114,37 @@ class PostFeed(Feed):
     link = RSS_LINK
 
     def items(self):
-        return Post.objects.public()[:RSS_NUM]
+        return feed_items()
 
     def item_title(self, item):
-        return item.fields.title
+        return item['title']
 
     def item_link(self, item):
-        return item.get_absolute_url()
+        return item['link']
 
     def item_description(self, item):
-        return render_to_string(item.fields.rss_template, {
-            'post': item,
-            'obj': item,
-            'post_type': slugify(item.fields.__class__.__name__),
-            'list_view': False,
-            'detail_view': True,
-        })
+        return item['description']
 
     def item_pubdate(self, item):
-        return item.date_published
+        return item['pubdate']
 
     def item_author_name(self, item):
-        if item.author.first_name or item.author.last_name:
-            return '%s %s' % (item.author.first_name, item.author.last_name,)
-        else:
-            return item.author.username
+        return item['author_name']
 
     def item_author_email(self, item):
-        if item.author.email:
-            return item.author.email
-        return ''
+        return item['author_email']
+
+
+class AtomPostFeed(PostFeed):
+    """
+    Atom feed of all public posts
+    """
+    feed_type = Atom1Feed
+    subtitle = RSS_DESCRIPTION
+
+
+class JSONPostFeed(PostFeed):
+    """
+    JSON Feed of all public posts
+    """
+    feed_type = JSONFeedGenerator
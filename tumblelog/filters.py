@@ -1,74 +1,61 @@
+from django.db.models import Q
 from django.utils.translation import ugettext_lazy as _
 from django.contrib.admin import SimpleListFilter
 
+from tumblelog.managers import past_filter, private_filter, public_filter, \
+    queued_filter
 
-class PubliclyVisibleListFilter(SimpleListFilter):
+
+class PostTypeListFilter(SimpleListFilter):
     """
-    A list filter that allows users to filter by the publication date
+    Base class for list filters whose options each apply a predicate directly
+    to the changelist's queryset, so that filtering remains a single query.
+
+    Subclasses define choices, a sequence of (value, label, predicate) tuples,
+    where predicate is a callable returning a Q object.
     """
-    title = _('Visibility to Public')
-    parameter_name = 'public'
+    choices = ()
 
     def lookups(self, request, model_admin):
-        return (
-            ('1', _('Visible')),
-            ('0', _('Not Visible')),
-        )
+        return [(value, label) for value, label, predicate in self.choices]
 
     def queryset(self, request, queryset):
-        if queryset:
-            kls = queryset[0].__class__
-            value = self.value()
-            if value == '0':
-                private = [x.id for x in kls.objects.private()]
-                return queryset.filter(pk__in=private)
-            elif value == '1':
-                public = [x.id for x in kls.objects.public()]
-                return queryset.filter(pk__in=public)
+        for value, label, predicate in self.choices:
+            if self.value() == value:
+                return queryset.filter(predicate())
 
 
-class PublicationDateListFilter(SimpleListFilter):
+class PubliclyVisibleListFilter(PostTypeListFilter):
     """
     A list filter that allows users to filter by the publication date
     """
-    title = _('Publication Date')
-    parameter_name = 'pub_date'
+    title = _('Visibility to Public')
+    parameter_name = 'public'
+    choices = (
+        ('1', _('Visible'), public_filter),
+        ('0', _('Not Visible'), private_filter),
+    )
 
-    def lookups(self, request, model_admin):
-        return (
-            ('future', _('In the future')),
-            ('past', _('In the past')),
-        )
 
-    def queryset(self, request, queryset):
-        if queryset:
-            kls = queryset[0].__class__
-            value = self.value()
-            if value == 'future':
-                future = [x.id for x in kls.objects.queued()]
-                return queryset.filter(pk__in=future)
-            elif value == 'past':
-                past = [x.id for x in kls.objects.past()]
-                return queryset.filter(pk__in=past)
+class PublicationDateListFilter(PostTypeListFilter):
+    """
+    A list filter that allows users to filter by the publication date
+    """
+    title = _('Publication Date')
+    parameter_name = 'pub_date'
+    choices = (
+        ('future', _('In the future'), queued_filter),
+        ('past', _('In the past'), past_filter),
+    )
 
 
-class StatusListFilter(SimpleListFilter):
+class StatusListFilter(PostTypeListFilter):
     """
     A list filter that allows users to filter by the post status
     """
     title = _('Status')
     parameter_name = 'status'
-
-    def lookups(self, request, model_admin):
-        return (
-            ('draft', _('Draft')),
-            ('published', _('Published')),
-        )
-
-    def queryset(self, request, queryset):
-        if queryset:
-            value = self.value()
-            if value == 'draft':
-                return queryset.filter(status='d')
-            elif value == 'published':
-                return queryset.filter(status='p')
+    choices = (
+        ('draft', _('Draft'), lambda: Q(status='d')),
+        ('published', _('Published'), lambda: Q(status='p')),
+    )
@@ -0,0 +1,53 @@
+"""
+Server-side syntax highlighting for the Code post type's snippets.
+
+Highlighting is performed by the callable named by TUMBLELOG_CODE_HIGHLIGHTER,
+which is passed a snippet's code and language (one of CODE_LANGUAGES) and
+returns its highlighted HTML, or None if it cannot be highlighted. The default
+highlighter uses Pygments, if it is installed.
+"""
+from tumblelog.settings import CODE_HIGHLIGHT_STYLE, CODE_HIGHLIGHTER
+from tumblelog.util import import_attribute
+
+try:
+    from pygments import highlight
+    from pygments.formatters import HtmlFormatter
+    from pygments.lexers import get_lexer_by_name
+    from pygments.util import ClassNotFound
+    PYGMENTS_INSTALLED = True
+except ImportError:
+    PYGMENTS_INSTALLED = False
+
+# Maps each of CODE_LANGUAGES to the Pygments lexer and its options
+PYGMENTS_LEXERS = {
+    'generic': ('text', {}),
+    'html': ('html', {}),
+    'css': ('css', {}),
+    'javascript': ('javascript', {}),
+    'php': ('php', {'startinline': True}),
+    'python': ('python', {}),
+    'ruby': ('ruby', {}),
+    'shell': ('bash', {}),
+}
+
+
+def pygments_highlighter(code, language):
+    """
+    Highlights code with Pygments, using inline styles so that the result is
+    highlighted wherever it is displayed, including in feed readers. Returns
+    None if Pygments is not installed.
+    """
+    if not PYGMENTS_INSTALLED:
+        return None
+    name, options = PYGMENTS_LEXERS.get(language, ('text', {}))
+    try:
+        lexer = get_lexer_by_name(name, **options)
+    except ClassNotFound:
+        lexer = get_lexer_by_name('text')
+    formatter = HtmlFormatter(noclasses=True, style=CODE_HIGHLIGHT_STYLE)
+    return highlight(code, lexer, formatter)
+
+
+def highlight_code(code, language):
+    "Returns code highlighted by the configured highlighter, or None"
+    return import_attribute(CODE_HIGHLIGHTER)(code, language)
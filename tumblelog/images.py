@@ -0,0 +1,193 @@
+"""
+Responsive derivatives of the Image post type's uploads.
+
+When an image is saved, a copy of it is encoded at each of the widths in
+TUMBLELOG_IMAGE_WIDTHS narrower than the upload, in each of the formats in
+TUMBLELOG_IMAGE_FORMATS. Decoding, resizing and encoding are CPU-bound, so the
+copies are encoded in parallel by a pool of worker processes. The derivatives
+are stored alongside the upload, and described by a list of dictionaries
+holding each one's name, width, height and format.
+
+When an image is saved through the admin, the pool is forked from the web
+server process handling the request, which holds it until every copy is
+encoded. Set TUMBLELOG_IMAGE_WORKERS to 1 to encode in that process instead,
+and run the generate_image_derivatives command to encode copies in bulk.
+"""
+import multiprocessing
+import os
+from cStringIO import StringIO
+from itertools import chain
+
+from django.core.files.base import ContentFile
+from django.utils import simplejson
+
+from tumblelog.settings import IMAGE_FORMATS, IMAGE_QUALITY, IMAGE_WIDTHS, \
+    IMAGE_WORKERS
+
+try:
+    from PIL import Image as PILImage, ImageFile
+except ImportError:
+    import Image as PILImage
+    import ImageFile
+
+# Maps each of TUMBLELOG_IMAGE_FORMATS to PIL's name for it, the extension of
+# its files and the options it is saved with
+FORMATS = {
+    'jpeg': ('JPEG', 'jpg', {'progressive': True, 'optimize': True}),
+    'webp': ('WEBP', 'webp', {}),
+}
+
+# The fewest worker processes worth starting a pool for
+MIN_POOL_SIZE = 3
+
+
+def open_image(content):
+    """
+    Decodes the passed image data, flattening any transparency onto white
+    (JPEG has none) and converting it to a mode every format can encode.
+    """
+    image = PILImage.open(StringIO(content))
+    if image.mode in ('RGBA', 'LA', 'P'):
+        image = image.convert('RGBA')
+        background = PILImage.new('RGB', image.size, (255, 255, 255))
+        background.paste(image, mask=image.split()[3])
+        image = background
+    elif image.mode not in ('RGB', 'L'):
+        image = image.convert('RGB')
+    return image
+
+
+def encode(image, format, quality):
+    """
+    Returns the passed image encoded in the passed format, or None if it
+    cannot be (e.g. PIL was built without WebP).
+    """
+    pil_format, extension, options = FORMATS[format]
+    # Progressive and optimized JPEGs are written in a single block
+    ImageFile.MAXBLOCK = max(ImageFile.MAXBLOCK, \
+        image.size[0] * image.size[1] * 3)
+    output = StringIO()
+    try:
+        image.save(output, pil_format, quality=quality, **options)
+    except (IOError, KeyError, ValueError):
+        return None
+    return output.getvalue()
+
+
+def render_derivatives(task):
+    """
+    Returns a list of (width, height, format, bytes) tuples of copies of the
+    passed image data, resized to each of the passed widths and encoded in
+    each of the passed formats. The image is decoded once, however many
+    copies are made. Runs in a worker process, or in this one.
+    """
+    content, widths, formats, quality = task
+    try:
+        original = open_image(content)
+    except IOError:
+        return []
+    results = []
+    for width in widths:
+        height = max(1, int(round(original.size[1] * width / \
+            float(original.size[0]))))
+        image = original.resize((width, height), PILImage.ANTIALIAS)
+        for format in formats:
+            data = encode(image, format, quality)
+            if data is not None:
+                results.append((width, height, format, data))
+    return results
+
+
+def derivative_name(name, width, format):
+    "Returns the storage name of a derivative of the named file"
+    root = os.path.splitext(name)[0]
+    return '%s-%d.%s' % (root, width, FORMATS[format][1])
+
+
+def generate_derivatives(field_file, width, pool=None, workers=None):
+    """
+    Encodes and stores the derivatives of an uploaded image of the passed
+    width, returning a list describing them.
+
+    The widths are divided among up to workers (by default,
+    TUMBLELOG_IMAGE_WORKERS) processes, so that the image data is sent to,
+    and decoded by, each process once. The passed pool is used if given, e.g.
+    when many images are processed; otherwise one is started for the image.
+    If fewer than MIN_POOL_SIZE processes would be used, the copies are
+    encoded in this process instead, since starting a pool would cost more
+    than it saves.
+    """
+    widths = [w for w in sorted(IMAGE_WIDTHS, reverse=True) if w < width]
+    if not widths:
+        return []
+    field_file.open('rb')
+    try:
+        content = field_file.read()
+    finally:
+        field_file.close()
+
+    workers = min(workers or IMAGE_WORKERS or multiprocessing.cpu_count(), \
+        len(widths))
+    # Widths are dealt out in turn, so that each process gets a similar mix
+    # of large and small copies
+    tasks = [(content, widths[i::workers], IMAGE_FORMATS, IMAGE_QUALITY) for \
+        i in range(workers)]
+    if workers < MIN_POOL_SIZE:
+        results = map(render_derivatives, [(content, widths, IMAGE_FORMATS, \
+            IMAGE_QUALITY)])
+    elif pool is not None:
+        results = pool.map(render_derivatives, tasks)
+    else:
+        pool = multiprocessing.Pool(workers)
+        try:
+            results = pool.map(render_derivatives, tasks)
+        finally:
+            pool.close()
+            pool.join()
+
+    # Stored from this process, so that any storage backend may be used
+    derivatives = []
+    storage = field_file.storage
+    for w, h, format, data in sorted(chain(*results), \
+        key=lambda result: result[:3]):
+        name = derivative_name(field_file.name, w, format)
+        if storage.exists(name):
+            storage.delete(name)
+        derivatives.append({
+            'name': storage.save(name, ContentFile(data)),
+            'width': w,
+            'height': h,
+            'format': format,
+        })
+    return derivatives
+
+
+def delete_derivatives(storage, derivatives):
+    "Deletes the stored files of the passed derivatives"
+    for derivative in derivatives:
+        storage.delete(derivative['name'])
+
+
+def loads(value):
+    "Returns the list of derivatives stored in the passed JSON, if any"
+    if not value:
+        return []
+    return simplejson.loads(value)
+
+
+def dumps(derivatives):
+    "Returns the passed list of derivatives as JSON, for storage"
+    return simplejson.dumps(derivatives)
+
+
+def srcset(storage, derivatives, format, width=None, original=None):
+    """
+    Returns the value of a srcset attribute listing the derivatives of the
+    passed format, with the original image's URL at its own width, if given.
+    """
+    candidates = ['%s %dw' % (storage.url(derivative['name']), \
+        derivative['width']) for derivative in derivatives if \
+        derivative['format'] == format]
+    if original and width:
+        candidates.append('%s %dw' % (original, width))
+    return ', '.join(candidates)
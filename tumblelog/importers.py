@@ -0,0 +1,341 @@
+"""
+Readers and mappers used by the import_tumblelog management command.
+
+A reader is a generator yielding one dictionary (a record) per post in an
+archive. Each reader parses its file incrementally, so memory use does not
+grow with the size of the archive. A mapper is a callable accepting a record
+and returning an unsaved instance of a BasePostType subclass, or None to skip
+the record.
+"""
+import os
+import re
+from datetime import datetime
+from xml.etree.cElementTree import iterparse
+
+from django.db.models import get_models
+from django.template.defaultfilters import slugify
+from django.utils import simplejson
+from django.utils.dateparse import parse_datetime
+from django.utils.html import strip_tags
+from django.utils.text import Truncator
+
+from tumblelog.util import import_model
+
+WORDPRESS_DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+YOUTUBE_URL = re.compile(r'^https?://(www\.)?(youtube\.com|youtu\.be)/')
+VIMEO_URL = re.compile(r'^https?://(www\.)?vimeo\.com/')
+FLICKR_URL = re.compile(r'^https?://(www\.)?(flickr\.com|flic\.kr)/')
+INSTAGRAM_URL = re.compile(r'^https?://(www\.)?(instagram\.com|instagr\.am)/')
+
+
+def local_name(tag):
+    "Strips the namespace from an ElementTree tag name"
+    return tag.rsplit('}', 1)[-1]
+
+
+def iterelements(fileobj, tag):
+    """
+    Yields each element of the XML document with the passed tag name, ignoring
+    namespaces. Each element is removed from the tree once consumed, so that
+    memory use is bounded by the size of a single element.
+    """
+    stack = []
+    for event, elem in iterparse(fileobj, events=('start', 'end')):
+        if event == 'start':
+            stack.append(elem)
+            continue
+        stack.pop()
+        if local_name(elem.tag) == tag:
+            yield elem
+            elem.clear()
+            if stack:
+                stack[-1].remove(elem)
+
+
+def read_jsonl(fileobj):
+    """
+    Reads a file containing one JSON object per line. Blank lines are skipped.
+    """
+    for line in fileobj:
+        line = line.strip()
+        if line:
+            yield simplejson.loads(line)
+
+
+def read_tumblr(fileobj):
+    """
+    Reads the XML returned by version 1 of Tumblr's API, or an archive of it.
+    Each record has the post's id, type, slug, url, private, date_published
+    and tags, plus the text of each of the post's other elements, keyed by tag
+    name (e.g. 'regular-title' or 'link-url'). Only the largest 'photo-url' is
+    kept.
+    """
+    for elem in iterelements(fileobj, 'post'):
+        timestamp = elem.get('unix-timestamp')
+        record = {
+            'id': elem.get('id'),
+            'type': elem.get('type'),
+            'slug': elem.get('slug'),
+            'url': elem.get('url'),
+            'private': elem.get('private') == 'true',
+            'date_published': timestamp and \
+                datetime.fromtimestamp(int(timestamp)) or None,
+            'tags': [],
+        }
+        photo_width = -1
+        for child in elem:
+            name = local_name(child.tag)
+            if name == 'tag':
+                record['tags'].append(child.text)
+            elif name == 'photo-url':
+                width = int(child.get('max-width') or 0)
+                if width > photo_width:
+                    photo_width = width
+                    record[name] = child.text
+            elif name not in record:
+                record[name] = child.text
+        yield record
+
+
+def read_wordpress(fileobj):
+    """
+    Reads a WordPress eXtended RSS (WXR) export. Each record has the item's
+    title, link, slug, type ('post', 'page', 'attachment', ...), status (the
+    WordPress status, e.g. 'publish' or 'draft'), date_published, body,
+    excerpt, tags and categories.
+    """
+    for elem in iterelements(fileobj, 'item'):
+        record = {'tags': [], 'categories': []}
+        for child in elem:
+            name = local_name(child.tag)
+            if name == 'title':
+                record['title'] = child.text
+            elif name == 'link':
+                record['link'] = child.text
+            elif name == 'post_name':
+                record['slug'] = child.text
+            elif name == 'post_type':
+                record['type'] = child.text
+            elif name == 'status':
+                record['status'] = child.text
+            elif name == 'post_date':
+                try:
+                    record['date_published'] = datetime.strptime(
+                        child.text or '', WORDPRESS_DATE_FORMAT)
+                except ValueError:
+                    record['date_published'] = None
+            elif name == 'encoded':
+                key = 'excerpt' in child.tag and 'excerpt' or 'body'
+                record[key] = child.text
+            elif name == 'category':
+                key = child.get('domain') == 'post_tag' and 'tags' or \
+                    'categories'
+                record[key].append(child.text)
+        yield record
+
+
+READERS = {
+    'jsonl': read_jsonl,
+    'tumblr': read_tumblr,
+    'wordpress': read_wordpress,
+}
+
+
+def guess_format(path):
+    "Guesses the format of the archive at path from its extension"
+    extension = os.path.splitext(path)[1].lower()
+    if extension in ('.jsonl', '.json'):
+        return 'jsonl'
+    if extension == '.xml':
+        return 'tumblr'
+    if extension == '.wxr':
+        return 'wordpress'
+    return None
+
+
+def post_type_models():
+    """
+    Returns a dictionary of each installed BasePostType subclass, keyed by its
+    post_type_name (e.g. 'article' or 'youtube'). It is built once, so that
+    mappers may call this for every record.
+    """
+    if not hasattr(post_type_models, 'models'):
+        from tumblelog.models.base import BasePostType
+        post_type_models.models = dict((slugify(model.__name__), model) for \
+            model in get_models() if issubclass(model, BasePostType))
+    return post_type_models.models
+
+
+def get_author(username):
+    """
+    Returns the User with the passed username, or None if there is none.
+    Users are looked up once each, so that mappers may call this for every
+    record.
+    """
+    from django.contrib.auth.models import User
+    if not hasattr(get_author, 'users'):
+        get_author.users = {}
+    if username not in get_author.users:
+        users = User.objects.filter(username=username)[:1]
+        get_author.users[username] = users and users[0] or None
+    return get_author.users[username]
+
+
+def add_tags(model, pairs):
+    """
+    Tags newly created objects of model, passed as (object, tag names) pairs.
+    Missing Tag rows are created once each, and every tagged item is inserted
+    with a single bulk_create(), rather than adding tags object by object.
+    """
+    from django.contrib.contenttypes.models import ContentType
+    from tumblelog.managers import SQLITE_MAX_VARIABLES, batches
+    names = set(name for obj, tags in pairs for name in tags)
+    if not names:
+        return
+    through = model.tags.through
+    tag_model = through.tag_model()
+    pks = {}
+    for batch in batches(list(names), SQLITE_MAX_VARIABLES):
+        pks.update(tag_model.objects.filter(name__in=batch) \
+            .values_list('name', 'pk'))
+    for name in names:
+        if name not in pks:
+            # Created individually, so that Tag.save() assigns a unique slug
+            pks[name] = tag_model.objects.create(name=name).pk
+
+    content_type = ContentType.objects.get_for_model(model)
+    through.objects.bulk_create([through(
+        tag_id=pks[name],
+        content_type=content_type,
+        object_id=obj.pk,
+    ) for obj, tags in pairs for name in set(tags)])
+
+
+def summarize(html, words=8):
+    "Returns the first few words of an HTML fragment as plain text"
+    return Truncator(strip_tags(html or u'')).words(words)
+
+
+def map_jsonl(record):
+    """
+    Maps a record whose 'type' names a post type, either by post_type_name
+    (e.g. 'article') or as 'app_label.ModelName', and whose other keys are
+    values for that post type's fields. The author is given by
+    'author_username', since user ids differ between sites. Keys that are not
+    fields, and the primary key, are ignored.
+
+    The output of export_tumblelog may be read, but only each post's fields,
+    author and tags are imported: related objects (e.g. a Code post's
+    snippets) are not, and creation and modification dates are those of the
+    import.
+    """
+    record = dict(record)
+    name = record.pop('type', None)
+    if name and '.' in name:
+        model = import_model(name)
+    else:
+        model = post_type_models().get(name)
+    if model is None:
+        return None
+
+    field_names = set()
+    for field in model._meta.fields:
+        if not field.primary_key and field.name != 'author':
+            field_names.update((field.name, field.attname))
+    values = dict((str(key), value) for key, value in record.items() if \
+        key in field_names)
+    for key in ('date_published', 'date_added', 'date_modified'):
+        if isinstance(values.get(key), basestring):
+            values[key] = parse_datetime(values[key])
+    if record.get('author_username'):
+        values['author'] = get_author(record['author_username'])
+    return model(**values)
+
+
+def map_tumblr(record):
+    """
+    Maps Tumblr posts onto the contrib post types. Titled text posts become
+    Articles, and untitled ones Text. Links become Links, quotes become Text,
+    and videos or photos hosted by a provider with a contrib post type become
+    that post type. Other posts, including photos hosted by Tumblr, are
+    skipped.
+    """
+    from tumblelog.models.contrib.photo import Flickr, Instagram
+    from tumblelog.models.contrib.link import Link
+    from tumblelog.models.contrib.text import Article, TextSnippet
+    from tumblelog.models.contrib.video import Vimeo, YouTube
+
+    post_type = record.get('type')
+    obj = None
+    if post_type == 'regular':
+        body = record.get('regular-body') or u''
+        if record.get('regular-title'):
+            obj = Article(title=record['regular-title'], excerpt=u'', \
+                body=body)
+        else:
+            obj = TextSnippet(title=summarize(body), body=body)
+    elif post_type == 'link':
+        url = record.get('link-url')
+        obj = Link(
+            title=strip_tags(record.get('link-text') or url or u''),
+            link=url,
+            link_text=record.get('link-text'),
+            caption=record.get('link-description') or u'',
+        )
+    elif post_type == 'quote':
+        text = record.get('quote-text') or u''
+        body = u'<blockquote>%s</blockquote>' % text
+        if record.get('quote-source'):
+            body += u'<p>%s</p>' % record['quote-source']
+        obj = TextSnippet(title=summarize(text), body=body)
+    elif post_type == 'video':
+        url = (record.get('video-source') or u'').strip()
+        caption = record.get('video-caption') or u''
+        if YOUTUBE_URL.match(url):
+            obj = YouTube(title=summarize(caption) or url, youtube_url=url, \
+                caption=caption)
+        elif VIMEO_URL.match(url):
+            obj = Vimeo(title=summarize(caption) or url, vimeo_url=url, \
+                caption=caption)
+    elif post_type == 'photo':
+        url = (record.get('photo-link-url') or u'').strip()
+        caption = record.get('photo-caption') or u''
+        if FLICKR_URL.match(url):
+            obj = Flickr(title=summarize(caption) or url, flickr_url=url, \
+                caption=caption)
+        elif INSTAGRAM_URL.match(url):
+            obj = Instagram(title=summarize(caption) or url, \
+                instagram_url=url, caption=caption)
+
+    if obj is not None:
+        obj.slug = (record.get('slug') or u'')[:64] or \
+            u'post-%s' % record.get('id')
+        obj.status = record.get('private') and 'd' or 'p'
+        obj.date_published = record.get('date_published')
+    return obj
+
+
+def map_wordpress(record):
+    """
+    Maps WordPress posts onto Articles. Pages, attachments and other items are
+    skipped. Only published posts are marked as published.
+    """
+    from tumblelog.models.contrib.text import Article
+
+    if record.get('type') != 'post':
+        return None
+    return Article(
+        title=record.get('title') or summarize(record.get('body')),
+        slug=(record.get('slug') or u'')[:64],
+        excerpt=record.get('excerpt') or u'',
+        body=record.get('body') or u'',
+        status=record.get('status') == 'publish' and 'p' or 'd',
+        date_published=record.get('date_published'),
+    )
+
+
+MAPPERS = {
+    'jsonl': map_jsonl,
+    'tumblr': map_tumblr,
+    'wordpress': map_wordpress,
+}
@@ -0,0 +1,52 @@
+from optparse import make_option
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from tumblelog.models import Post
+
+
+class Command(BaseCommand):
+    """
+    Builds the denormalized snapshot stored on each Post, used to render list
+    views and feeds when TUMBLELOG_USE_SNAPSHOTS is enabled.
+    """
+    help = 'Builds the render snapshot stored on each post.'
+    option_list = BaseCommand.option_list + (
+        make_option('--missing',
+            action='store_true',
+            dest='missing',
+            default=False,
+            help='Only build snapshots for posts that have none'
+        ),
+        make_option('--batch-size',
+            action='store',
+            type='int',
+            dest='batch_size',
+            default=500,
+            help='Number of posts loaded and written per transaction'
+        ),
+    )
+
+    def handle(self, *args, **options):
+        posts = Post.objects.order_by('id')
+        if options['missing']:
+            posts = posts.filter(snapshot__isnull=True)
+
+        last_id = 0
+        built = 0
+        while True:
+            batch = list(posts.filter(id__gt=last_id).select_generic_related()\
+                [:options['batch_size']])
+            if not batch:
+                break
+            with transaction.commit_on_success():
+                for post in batch:
+                    if post.fields is not None:
+                        Post.objects.filter(id=post.id).update(
+                            snapshot=post.fields.get_snapshot()
+                        )
+                        built += 1
+            last_id = batch[-1].id
+
+        self.stdout.write('Built %d snapshot(s).\n' % built)
@@ -0,0 +1,236 @@
+import gzip
+import hashlib
+import multiprocessing
+import os
+from optparse import make_option
+
+from django.core.management.base import BaseCommand, CommandError
+from django.core.urlresolvers import reverse
+from django.db import connection
+from django.test.client import RequestFactory
+from django.utils import simplejson
+from django.views.generic.list import ListView
+
+from tumblelog.feeds import AtomPostFeed, JSONPostFeed, PostFeed
+from tumblelog.models import Post
+from tumblelog.settings import POSTS_PER_PAGE, RSS_NUM
+from tumblelog.views import PostDetailView, PostListView
+
+MANIFEST_NAME = '.tumblelog-manifest.json'
+
+# Feeds are written with an extension, so that the web server sends them with
+# the right content type
+FEEDS = (
+    ('feed', 'tumblelog:feed', 'index.xml'),
+    ('atom_feed', 'tumblelog:atom_feed', 'index.xml'),
+    ('json_feed', 'tumblelog:json_feed', 'index.json'),
+)
+
+
+class StaticPostListView(PostListView):
+    """
+    PostListView, always paginated by page number, since cursors cannot be
+    mapped onto files.
+    """
+
+    def paginate_queryset(self, queryset, page_size):
+        return ListView.paginate_queryset(self, queryset, page_size)
+
+    def get_context_data(self, **kwargs):
+        context = super(StaticPostListView, self).get_context_data(**kwargs)
+        context['cursor_pagination'] = False
+        return context
+
+
+def get_views():
+    return {
+        'list': StaticPostListView.as_view(),
+        'detail': PostDetailView.as_view(),
+        'feed': PostFeed(),
+        'atom_feed': AtomPostFeed(),
+        'json_feed': JSONPostFeed(),
+    }
+
+
+def write_file(path, content):
+    """
+    Writes content to path, and a gzipped copy alongside it, for use with
+    e.g. nginx's gzip_static. Each file is written under a temporary name and
+    then renamed, so that a partially written file is never served.
+    """
+    directory = os.path.dirname(path)
+    if not os.path.isdir(directory):
+        try:
+            os.makedirs(directory)
+        except OSError:
+            if not os.path.isdir(directory):
+                raise
+
+    partial = '%s.tmp' % path
+    with open(partial, 'wb') as f:
+        f.write(content)
+    os.rename(partial, path)
+
+    partial = '%s.gz.tmp' % path
+    with open(partial, 'wb') as f:
+        compressed = gzip.GzipFile(os.path.basename(path), 'wb', 9, f, 0)
+        compressed.write(content)
+        compressed.close()
+    os.rename(partial, '%s.gz' % path)
+
+
+def render_page(task):
+    """
+    Renders a single page and writes it to disk. Runs in a worker process;
+    each worker opens its own database connection on first use.
+    """
+    output, host, name, url, query, kwargs, filename = task
+    if not hasattr(render_page, 'views'):
+        render_page.views = get_views()
+        render_page.factory = RequestFactory(HTTP_HOST=host)
+    request = render_page.factory.get(url, query)
+    response = render_page.views[name](request, **kwargs)
+    if hasattr(response, 'render') and callable(response.render):
+        response.render()
+    if response.status_code != 200:
+        raise CommandError('%s returned status %d.' % (url, \
+            response.status_code))
+    path = os.path.join(output, url.lstrip('/'), filename)
+    write_file(path, response.content)
+    return path
+
+
+def signature(*values):
+    "Returns a digest of the passed values, used to detect changed pages"
+    return hashlib.md5(repr(values)).hexdigest()
+
+
+class Command(BaseCommand):
+    """
+    Renders the tumblelog to a directory of static files: each page of the
+    post listing, each post's detail page and each feed, with a gzipped copy
+    of each. A manifest of what was rendered is kept alongside, so that later
+    runs only render pages whose posts have changed.
+    """
+    args = '<directory>'
+    help = 'Renders the tumblelog to a directory of static files.'
+    option_list = BaseCommand.option_list + (
+        make_option('--workers',
+            action='store',
+            type='int',
+            dest='workers',
+            default=multiprocessing.cpu_count(),
+            help='Number of processes used to render pages'
+        ),
+        make_option('--host',
+            action='store',
+            dest='host',
+            default='localhost',
+            help='Host name used to build absolute URLs, e.g. in the feeds'
+        ),
+        make_option('--force',
+            action='store_true',
+            dest='force',
+            default=False,
+            help='Render every page, whether or not it has changed'
+        ),
+    )
+
+    def handle(self, *args, **options):
+        if len(args) != 1:
+            raise CommandError('Pass the directory to write to.')
+        output = os.path.abspath(args[0])
+        host = options['host']
+        previous = {} if options['force'] else self.read_manifest(output)
+        manifest = {'posts': {}, 'pages': {}, 'feeds': {}}
+        tasks = []
+
+        # A single query lists every public post, in the list view's order,
+        # with what is needed to tell which pages have changed
+        posts = list(Post.objects.public().values_list('id', 'slug', \
+            'date_modified'))
+
+        for pk, slug, date_modified in posts:
+            value = signature(date_modified)
+            manifest['posts'][slug] = value
+            if previous.get('posts', {}).get(slug) != value:
+                url = reverse('tumblelog:detail', kwargs={'slug': slug})
+                tasks.append((output, host, 'detail', url, {}, \
+                    {'slug': slug}, 'index.html'))
+
+        num_pages = max(1, (len(posts) + POSTS_PER_PAGE - 1) // POSTS_PER_PAGE)
+        list_url = reverse('tumblelog:list')
+        for number in range(1, num_pages + 1):
+            start = (number - 1) * POSTS_PER_PAGE
+            value = signature(posts[start:start + POSTS_PER_PAGE], number, \
+                num_pages)
+            manifest['pages'][str(number)] = value
+            if previous.get('pages', {}).get(str(number)) != value:
+                if number == 1:
+                    tasks.append((output, host, 'list', list_url, {}, {}, \
+                        'index.html'))
+                else:
+                    tasks.append((output, host, 'list', '%spage/%d/' % (
+                        list_url, number), {'page': number}, {}, \
+                        'index.html'))
+
+        value = signature(posts[:RSS_NUM])
+        for name, url_name, filename in FEEDS:
+            manifest['feeds'][name] = value
+            if previous.get('feeds', {}).get(name) != value:
+                tasks.append((output, host, name, reverse(url_name), {}, {}, \
+                    filename))
+
+        self.render(tasks, options['workers'])
+        removed = self.remove_stale(output, previous, manifest, list_url)
+        self.write_manifest(output, manifest)
+        self.stdout.write('Rendered %d page(s), removed %d, to %s.\n' % (
+            len(tasks),
+            removed,
+            output,
+        ))
+
+    def render(self, tasks, workers):
+        # Worker processes must not share the parent's database connection
+        connection.close()
+        if workers > 1 and len(tasks) > 1:
+            pool = multiprocessing.Pool(workers)
+            try:
+                pool.map(render_page, tasks, chunksize=8)
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            map(render_page, tasks)
+
+    def remove_stale(self, output, previous, manifest, list_url):
+        "Removes the files of posts and pages that no longer exist"
+        paths = []
+        for slug in previous.get('posts', {}):
+            if slug not in manifest['posts']:
+                paths.append(reverse('tumblelog:detail', \
+                    kwargs={'slug': slug}))
+        for number in previous.get('pages', {}):
+            if number not in manifest['pages']:
+                paths.append('%spage/%s/' % (list_url, number))
+
+        removed = 0
+        for url in paths:
+            path = os.path.join(output, url.lstrip('/'), 'index.html')
+            for name in (path, '%s.gz' % path):
+                if os.path.exists(name):
+                    os.remove(name)
+            removed += 1
+        return removed
+
+    def read_manifest(self, output):
+        path = os.path.join(output, MANIFEST_NAME)
+        if os.path.exists(path):
+            with open(path) as f:
+                return simplejson.load(f)
+        return {}
+
+    def write_manifest(self, output, manifest):
+        path = os.path.join(output, MANIFEST_NAME)
+        with open(path, 'w') as f:
+            simplejson.dump(manifest, f)
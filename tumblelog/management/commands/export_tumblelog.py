@@ -0,0 +1,102 @@
+from datetime import datetime
+from optparse import make_option
+
+from django.core.management.base import BaseCommand, CommandError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import reset_queries
+from django.utils import simplejson
+from django.utils.dateparse import parse_date, parse_datetime
+
+from tumblelog.models import Post
+from tumblelog.settings import USE_TAGGIT
+from tumblelog.snapshots import serialize_value
+
+
+class Command(BaseCommand):
+    """
+    Exports posts as JSON lines, one post per line, in the format read by the
+    import_tumblelog command. Posts are loaded in chunks, with a single query
+    per post type per chunk, so memory use does not grow with the size of the
+    tumblelog.
+    """
+    help = 'Exports posts, with their post type fields, as JSON lines.'
+    option_list = BaseCommand.option_list + (
+        make_option('--since',
+            action='store',
+            dest='since',
+            default=None,
+            help='Only export posts modified at or after this date or time'
+        ),
+        make_option('--output',
+            action='store',
+            dest='output',
+            default=None,
+            help='File to write to; defaults to standard output'
+        ),
+        make_option('--batch-size',
+            action='store',
+            type='int',
+            dest='batch_size',
+            default=500,
+            help='Number of posts loaded per chunk'
+        ),
+    )
+
+    def handle(self, *args, **options):
+        posts = Post.objects.order_by('id').select_related('author')
+        if options['since']:
+            posts = posts.filter(date_modified__gte=self.parse_since(
+                options['since']))
+
+        output = options['output'] and open(options['output'], 'w') or \
+            self.stdout
+        exported = 0
+        last_id = 0
+        try:
+            while True:
+                chunk = list(posts.filter(id__gt=last_id) \
+                    .select_generic_related()[:options['batch_size']])
+                if not chunk:
+                    break
+                for post in chunk:
+                    if post.fields is not None:
+                        output.write(simplejson.dumps(self.export(post), \
+                            cls=DjangoJSONEncoder))
+                        output.write('\n')
+                        exported += 1
+                last_id = chunk[-1].id
+                reset_queries()
+        finally:
+            if output is not self.stdout:
+                output.close()
+
+        self.stderr.write('Exported %d post(s).\n' % exported)
+
+    def parse_since(self, value):
+        since = parse_datetime(value)
+        if since is None:
+            date = parse_date(value)
+            if date is None:
+                raise CommandError('Unable to parse --since %r.' % value)
+            since = datetime.combine(date, datetime.min.time())
+        return since
+
+    def export(self, post):
+        """
+        Returns a dictionary of the values of the post type object's fields,
+        its type, the URL and author of its post, and any relations declared
+        in its TumblelogMeta.prefetch_related (e.g. a Code post's snippets).
+        """
+        obj = post.fields
+        data = serialize_value(obj)
+        data.update({
+            'type': post.post_type_name,
+            'post_id': post.id,
+            'url': post.get_absolute_url(),
+            'author_username': post.author and post.author.username or None,
+        })
+        for name in obj._tumblelog_meta.prefetch_related:
+            data[name] = serialize_value(getattr(obj, name))
+        if USE_TAGGIT:
+            data['tags'] = [tag.name for tag in obj.tags.all()]
+        return data
@@ -0,0 +1,81 @@
+import multiprocessing
+from optparse import make_option
+
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from tumblelog.models.contrib.photo import Image
+from tumblelog.settings import IMAGE_WORKERS
+
+
+class Command(BaseCommand):
+    """
+    Stores the dimensions of images uploaded before they were recorded, and
+    generates their resized copies, e.g. after upgrading or changing
+    TUMBLELOG_IMAGE_WIDTHS or TUMBLELOG_IMAGE_FORMATS. A single pool of worker
+    processes is shared by every image.
+    """
+    help = 'Generates the dimensions and resized copies of uploaded images.'
+    option_list = BaseCommand.option_list + (
+        make_option('--force',
+            action='store_true',
+            dest='force',
+            default=False,
+            help='Generate copies of every image, not just those missing them'
+        ),
+        make_option('--workers',
+            action='store',
+            type='int',
+            dest='workers',
+            default=IMAGE_WORKERS or multiprocessing.cpu_count(),
+            help='Number of processes used to resize images'
+        ),
+        make_option('--batch-size',
+            action='store',
+            type='int',
+            dest='batch_size',
+            default=100,
+            help='Number of images loaded at a time'
+        ),
+    )
+
+    def handle(self, *args, **options):
+        objects = Image.objects.order_by('id')
+        if not options['force']:
+            objects = objects.filter(Q(derivatives__isnull=True) | \
+                Q(derivatives='') | Q(width__isnull=True))
+        pool = multiprocessing.Pool(options['workers'])
+        generated = 0
+        failed = 0
+        last_id = 0
+        try:
+            while True:
+                batch = list(objects.filter(id__gt=last_id) \
+                    [:options['batch_size']])
+                if not batch:
+                    break
+                for obj in batch:
+                    if not obj.image:
+                        continue
+                    try:
+                        obj.generate_derivatives(pool, options['workers'])
+                    except (IOError, OSError), e:
+                        self.stderr.write('Unable to read %s: %s\n' % (
+                            obj.image.name, e))
+                        failed += 1
+                        continue
+                    obj.touch(
+                        width=obj.width,
+                        height=obj.height,
+                        derivatives=obj.derivatives
+                    )
+                    generated += 1
+                last_id = batch[-1].id
+        finally:
+            pool.close()
+            pool.join()
+
+        self.stdout.write('Generated copies of %d image(s); %d failed.\n' % (
+            generated,
+            failed,
+        ))
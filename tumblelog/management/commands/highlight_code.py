@@ -0,0 +1,48 @@
+from optparse import make_option
+
+from django.core.management.base import BaseCommand
+
+from tumblelog.models.contrib.code import Code, CodeSnippet
+from tumblelog.util import atomic
+
+
+class Command(BaseCommand):
+    """
+    Highlights every code snippet again, e.g. after installing Pygments or
+    changing TUMBLELOG_CODE_HIGHLIGHTER or TUMBLELOG_CODE_HIGHLIGHT_STYLE.
+    """
+    help = 'Highlights the code of every code snippet again.'
+    option_list = BaseCommand.option_list + (
+        make_option('--batch-size',
+            action='store',
+            type='int',
+            dest='batch_size',
+            default=500,
+            help='Number of snippets loaded and written per transaction'
+        ),
+    )
+
+    def handle(self, *args, **options):
+        snippets = CodeSnippet.objects.order_by('id')
+        last_id = 0
+        highlighted = 0
+        while True:
+            batch = list(snippets.filter(id__gt=last_id) \
+                [:options['batch_size']])
+            if not batch:
+                break
+            changed = [snippet for snippet in batch if snippet.highlight()]
+            with atomic():
+                for snippet in changed:
+                    CodeSnippet.objects.filter(pk=snippet.pk).update(
+                        highlighted=snippet.highlighted
+                    )
+                # Each post is touched once, however many of its snippets
+                # changed, so that its fragments and snapshot are rebuilt
+                post_ids = set(snippet.post_id for snippet in changed)
+                for post in Code.objects.filter(pk__in=post_ids):
+                    post.touch()
+            highlighted += len(changed)
+            last_id = batch[-1].id
+
+        self.stdout.write('Highlighted %d snippet(s).\n' % highlighted)
@@ -0,0 +1,142 @@
+import os
+import time
+from itertools import islice
+from optparse import make_option
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import reset_queries
+
+from tumblelog import importers
+from tumblelog.settings import IMPORT_MAPPER, USE_TAGGIT
+from tumblelog.util import atomic, import_attribute
+
+
+class Command(BaseCommand):
+    """
+    Imports posts from a JSON lines file, a Tumblr XML archive, or a WordPress
+    export. The archive is streamed, mapped onto post types by a pluggable
+    mapper, and written in batched transactions with
+    PostManager.bulk_create_posts(). oEmbed post types are retrieved by the
+    next run of the refresh_oembed command.
+    """
+    args = '<path>'
+    help = 'Imports posts from a JSON lines, Tumblr or WordPress archive.'
+    option_list = BaseCommand.option_list + (
+        make_option('--format',
+            action='store',
+            dest='format',
+            default=None,
+            choices=sorted(importers.READERS.keys()),
+            help='Format of the archive; guessed from its extension if omitted'
+        ),
+        make_option('--mapper',
+            action='store',
+            dest='mapper',
+            default=None,
+            help='Dotted path to a callable mapping records onto post types'
+        ),
+        make_option('--batch-size',
+            action='store',
+            type='int',
+            dest='batch_size',
+            default=500,
+            help='Number of records written per transaction'
+        ),
+        make_option('--checkpoint',
+            action='store',
+            dest='checkpoint',
+            default=None,
+            help='File recording progress, used to resume an interrupted run'
+        ),
+    )
+
+    def handle(self, *args, **options):
+        if len(args) != 1:
+            raise CommandError('Pass the path of a single archive.')
+        path = args[0]
+        archive_format = options['format'] or importers.guess_format(path)
+        if archive_format not in importers.READERS:
+            raise CommandError('Unable to guess the format of %s; pass '
+                '--format.' % path)
+
+        mapper = options['mapper'] or IMPORT_MAPPER
+        if mapper:
+            mapper = import_attribute(mapper)
+        else:
+            mapper = importers.MAPPERS[archive_format]
+
+        checkpoint = options['checkpoint']
+        start = self.read_checkpoint(checkpoint)
+        if start:
+            self.stdout.write('Resuming after record %d.\n' % start)
+
+        read = start
+        imported = 0
+        skipped = 0
+        started = time.time()
+        with open(path, 'rb') as archive:
+            reader = importers.READERS[archive_format]
+            records = islice(reader(archive), start, None)
+            while True:
+                batch = list(islice(records, options['batch_size']))
+                if not batch:
+                    break
+                written = self.write(batch, mapper)
+                read += len(batch)
+                imported += written
+                skipped += len(batch) - written
+                self.write_checkpoint(checkpoint, read)
+                reset_queries()
+
+                elapsed = time.time() - started
+                self.stdout.write('%d record(s) read, %d imported, %d '
+                    'skipped (%.1f rows/s).\n' % (
+                        read,
+                        imported,
+                        skipped,
+                        elapsed and (read - start) / elapsed or 0,
+                    )
+                )
+
+        self.stdout.write('Imported %d post(s) in %.2fs.\n' % (
+            imported,
+            time.time() - started,
+        ))
+
+    def write(self, records, mapper):
+        """
+        Maps and inserts a batch of records, along with their Post objects and
+        tags, in a single transaction. Returns the number of posts created.
+        """
+        grouped = {}
+        for record in records:
+            obj = mapper(record)
+            if obj is not None:
+                grouped.setdefault(obj.__class__, []).append((obj, record))
+
+        with atomic():
+            for model, pairs in grouped.items():
+                objs = [obj for obj, record in pairs]
+                model._default_manager.bulk_create_posts(objs)
+                if USE_TAGGIT:
+                    importers.add_tags(model, [(obj, record.get('tags') or \
+                        []) for obj, record in pairs])
+        return sum(len(pairs) for pairs in grouped.values())
+
+    def read_checkpoint(self, checkpoint):
+        "Returns the number of records already imported"
+        if checkpoint and os.path.exists(checkpoint):
+            with open(checkpoint) as f:
+                return int(f.read().strip() or 0)
+        return 0
+
+    def write_checkpoint(self, checkpoint, read):
+        """
+        Records the number of records imported. The file is replaced rather
+        than rewritten, so it is never left partially written.
+        """
+        if checkpoint:
+            partial = '%s.tmp' % checkpoint
+            with open(partial, 'w') as f:
+                f.write('%d\n' % read)
+            os.rename(partial, checkpoint)
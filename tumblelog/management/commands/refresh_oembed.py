@@ -0,0 +1,90 @@
+from datetime import datetime
+from optparse import make_option
+
+from django.core.management.base import BaseCommand
+
+from tumblelog import refresh
+
+
+class Command(BaseCommand):
+    """
+    Refreshes oEmbed post types whose provider data has expired. Intended to be
+    run periodically (e.g. from cron) or by a background worker.
+    """
+    help = 'Refreshes oEmbed post types with expired provider data.'
+    option_list = BaseCommand.option_list + (
+        make_option('--queue',
+            action='store_true',
+            dest='queue',
+            default=False,
+            help='Refresh the longest-expired objects first, across post types'
+        ),
+        make_option('--limit',
+            action='store',
+            type='int',
+            dest='limit',
+            default=None,
+            help='Maximum number of objects to refresh per post type, or in ' \
+                'total with --queue'
+        ),
+        make_option('--workers',
+            action='store',
+            type='int',
+            dest='workers',
+            default=8,
+            help='Number of threads used to query providers'
+        ),
+        make_option('--concurrency',
+            action='store',
+            type='int',
+            dest='concurrency',
+            default=2,
+            help='Default maximum concurrent requests per endpoint'
+        ),
+        make_option('--rate',
+            action='store',
+            type='float',
+            dest='rate',
+            default=None,
+            help='Default maximum requests per second per endpoint'
+        ),
+        make_option('--batch-size',
+            action='store',
+            type='int',
+            dest='batch_size',
+            default=100,
+            help='Number of objects per post type written per transaction'
+        ),
+    )
+
+    def handle(self, *args, **options):
+        kwargs = {
+            'workers': options['workers'],
+            'concurrency': options['concurrency'],
+            'rate': options['rate'],
+            'batch_size': options['batch_size'],
+        }
+        if options['queue']:
+            stats = refresh.drain(limit=options['limit'], **kwargs)
+        else:
+            now = datetime.now()
+            querysets = [refresh.expired(model, now)[:options['limit']] for \
+                model in refresh.oembed_models()]
+            stats = refresh.Refresher(**kwargs).run(querysets)
+
+        for endpoint, counts in sorted(stats['endpoints'].items()):
+            self.stdout.write('%s: %d refreshed, %d failed\n' % (
+                endpoint,
+                counts['refreshed'],
+                counts['failed'],
+            ))
+        total = stats['refreshed'] + stats['failed']
+        elapsed = stats['elapsed']
+        self.stdout.write(
+            'Refreshed %d object(s), %d failure(s) in %.2fs (%.1f/s).\n' % (
+                stats['refreshed'],
+                stats['failed'],
+                elapsed,
+                elapsed and total / elapsed or 0,
+            )
+        )
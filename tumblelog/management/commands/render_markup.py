@@ -0,0 +1,49 @@
+from optparse import make_option
+
+from django.core.management.base import BaseCommand
+from django.db.models import get_models
+
+from tumblelog.models.base import BasePostType
+from tumblelog.util import atomic
+
+
+class Command(BaseCommand):
+    """
+    Renders the markup fields of every post again, e.g. after changing
+    TUMBLELOG_MARKUP_RENDERER.
+    """
+    help = 'Renders the markup fields of every post again.'
+    option_list = BaseCommand.option_list + (
+        make_option('--batch-size',
+            action='store',
+            type='int',
+            dest='batch_size',
+            default=500,
+            help='Number of objects loaded and written per transaction'
+        ),
+    )
+
+    def handle(self, *args, **options):
+        models = [model for model in get_models() if \
+            issubclass(model, BasePostType) and \
+            model._tumblelog_meta.markup_fields]
+
+        for model in models:
+            objects = model._default_manager.order_by('pk')
+            last_pk = 0
+            rendered = 0
+            while True:
+                batch = list(objects.filter(pk__gt=last_pk) \
+                    [:options['batch_size']])
+                if not batch:
+                    break
+                with atomic():
+                    for obj in batch:
+                        obj.touch(**obj.render_markup())
+                rendered += len(batch)
+                last_pk = batch[-1].pk
+
+            self.stdout.write('Rendered %d %s.\n' % (
+                rendered,
+                model._meta.verbose_name_plural,
+            ))
@@ -0,0 +1,63 @@
+from optparse import make_option
+
+from django.core.management.base import BaseCommand
+
+from tumblelog.models.contrib.file import File
+
+
+class Command(BaseCommand):
+    """
+    Stores the size, content type and hash of files uploaded before they were
+    recorded, so that downloading them never reads the size from storage.
+    """
+    help = 'Stores the size, content type and hash of uploaded files.'
+    option_list = BaseCommand.option_list + (
+        make_option('--force',
+            action='store_true',
+            dest='force',
+            default=False,
+            help='Read every file, not just those missing their metadata'
+        ),
+        make_option('--batch-size',
+            action='store',
+            type='int',
+            dest='batch_size',
+            default=100,
+            help='Number of files loaded at a time'
+        ),
+    )
+
+    def handle(self, *args, **options):
+        objects = File.objects.order_by('id')
+        if not options['force']:
+            objects = objects.filter(content_hash__isnull=True)
+        stored = 0
+        failed = 0
+        last_id = 0
+        while True:
+            batch = list(objects.filter(id__gt=last_id) \
+                [:options['batch_size']])
+            if not batch:
+                break
+            for obj in batch:
+                if not obj.file_file:
+                    continue
+                try:
+                    obj.store_file_metadata()
+                except (IOError, OSError), e:
+                    self.stderr.write('Unable to read %s: %s\n' % (
+                        obj.file_file.name, e))
+                    failed += 1
+                    continue
+                obj.touch(
+                    file_size=obj.file_size,
+                    content_type=obj.content_type,
+                    content_hash=obj.content_hash
+                )
+                stored += 1
+            last_id = batch[-1].id
+
+        self.stdout.write('Stored the metadata of %d file(s); %d failed.\n' % (
+            stored,
+            failed,
+        ))
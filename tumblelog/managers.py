@@ -1,10 +1,77 @@
 from datetime import datetime
+from itertools import islice
 
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.contenttypes.generic import GenericForeignKey
-from django.db import models
+from django.db import connections, models
 from django.db.models import Q
-from django.db.models.query import QuerySet
+from django.db.models.query import ITER_CHUNK_SIZE, QuerySet
+from django.template.defaultfilters import slugify
+
+from tumblelog.snapshots import attach_snapshots
+from tumblelog.util import atomic
+
+# SQLite limits the number of parameters in a single statement
+SQLITE_MAX_VARIABLES = 999
+DEFAULT_BATCH_SIZE = 500
+
+
+def attach_generic_related(model, objects):
+    """
+    Locates each GenericForeignKey field on the passed instances of model, and
+    attaches each related object. Optimizes Django's GenericForeignKey loading
+    facilities by only performing a single query for each related ContentType
+    object.
+    """
+    gfk_fields = [field for field in model._meta.virtual_fields if
+        isinstance(field, GenericForeignKey)]
+
+    for field in gfk_fields:
+        pt_field = model._meta.get_field(field.ct_field).column
+        pt_map = {}
+        data_map = {}
+
+        for obj in objects:
+            pt_id = getattr(obj, pt_field)
+            object_id = getattr(obj, field.fk_field)
+            if pt_id and object_id is not None:
+                pt_map.setdefault(pt_id, set()).add(object_id)
+
+        for pt_id, object_ids in pt_map.items():
+            content_type = ContentType.objects.get_for_id(pt_id)
+            model_class = content_type.model_class()
+            if hasattr(model_class, 'generic_related_queryset'):
+                pt_queryset = model_class.generic_related_queryset()
+            else:
+                pt_queryset = model_class._default_manager.select_related()
+            pt_queryset = pt_queryset.filter(id__in=object_ids)
+            for related in pt_queryset:
+                data_map[(pt_id, related.id)] = related
+
+        for obj in objects:
+            key = (getattr(obj, pt_field), getattr(obj, field.fk_field))
+            if key in data_map:
+                setattr(obj, field.name, data_map[key])
+
+    return objects
+
+
+def attach_post_types(model, objects, use_snapshots=False):
+    """
+    Attaches the object related via each GenericForeignKey to the passed
+    instances of model, building it from each instance's snapshot where
+    use_snapshots is set and one is available, and otherwise loading it with a
+    single query per ContentType. Instances whose related objects are already
+    attached are skipped.
+    """
+    cache_attrs = [field.cache_attr for field in model._meta.virtual_fields if
+        isinstance(field, GenericForeignKey)]
+    missing = [obj for obj in objects if not all(hasattr(obj, cache_attr) for \
+        cache_attr in cache_attrs)]
+    if use_snapshots:
+        missing = attach_snapshots(model, missing)
+    attach_generic_related(model, missing)
+    return objects
 
 
 class PostQuerySet(QuerySet):
@@ -15,53 +82,95 @@ class PostQuerySet(QuerySet):
     Based on http://djangosnippets.org/snippets/1773/
     """
 
+    def __init__(self, *args, **kwargs):
+        super(PostQuerySet, self).__init__(*args, **kwargs)
+        self._select_generic_related = False
+        self._select_snapshot = False
+
+    def _clone(self, klass=None, setup=False, **kwargs):
+        kwargs.setdefault('_select_generic_related', \
+            self._select_generic_related)
+        kwargs.setdefault('_select_snapshot', self._select_snapshot)
+        return super(PostQuerySet, self)._clone(klass, setup, **kwargs)
+
     def select_generic_related(self):
         """
-        Parses the queryset, locates each GenericForeignKey field, and
-        attaches each related object. Optimizes Django's GenericForeignKey
-        loading facilities by only performing a single query for each related
-        ContentType object.
+        Returns a new QuerySet that, when evaluated, attaches the object
+        related via each GenericForeignKey. Like select_related(), this is
+        lazy: nothing is fetched until the final (possibly sliced) queryset is
+        evaluated, only the rows actually fetched have their related objects
+        loaded, and count() and exists() are unaffected.
+        """
+        return self._clone(_select_generic_related=True)
+
+    def select_snapshot(self):
+        """
+        Like select_generic_related(), but builds each post's generic related
+        object from the snapshot stored on the post, without any further
+        queries. Posts without a snapshot are loaded as
+        select_generic_related() would.
         """
-        queryset = self._clone()
+        return self._clone(_select_snapshot=True)
 
-        gfk_fields = [field for field in self.model._meta.virtual_fields if
-            isinstance(field, GenericForeignKey)]
+    def iterator(self):
+        objects = super(PostQuerySet, self).iterator()
+        if self._select_generic_related or self._select_snapshot:
+            objects = self._generic_related_iterator(objects)
+        return objects
+
+    def _generic_related_iterator(self, objects):
+        """
+        Attaches generic related objects to the rows from the passed iterator
+        in chunks, performing a single query per ContentType per chunk. A
+        sliced queryset is handled as a single chunk.
+        """
+        chunk_size = ITER_CHUNK_SIZE
+        if self.query.high_mark is not None:
+            chunk_size = max(chunk_size, \
+                self.query.high_mark - self.query.low_mark)
+        while True:
+            chunk = list(islice(objects, chunk_size))
+            if not chunk:
+                break
+            attach_post_types(self.model, chunk, self._select_snapshot)
+            for obj in chunk:
+                yield obj
 
-        post_map = {}
-        pt_map = {}
-        data_map = {}
 
-        for post in queryset:
-            for field in gfk_fields:
-                ct_field = field.ct_field
-                pt_field = self.model._meta.get_field(ct_field).column
-                pt_map.setdefault(
-                    getattr(post, pt_field),
-                    {}
-                )[getattr(post, field.fk_field)] = (field.name, post.id)
-            post_map[post.id] = post
-
-        for pt_id, posts in pt_map.items():
-            if pt_id:
-                content_type = ContentType.objects.get_for_id(pt_id)
-                post_mgr = content_type.model_class().objects.select_related()
-                post_ids = posts.keys()
-                pt_queryset = post_mgr.filter(id__in=post_ids).all()
-                for post in pt_queryset:
-                    gfk_name, item_id = posts[post.id]
-                    data_map[(pt_id, post.id)] = post
-
-        for post in queryset:
-            for field in gfk_fields:
-                if (getattr(post, field.fk_field) != None):
-                    ct_field = field.ct_field
-                    pt_field = self.model._meta.get_field(ct_field).column
-                    post_type = getattr(post, pt_field)
-                    pt_field = getattr(post, field.fk_field)
-                    post_obj = data_map[(post_type, pt_field)]
-                    setattr(post, field.name, post_obj)
-
-        return queryset
+def batches(objs, batch_size):
+    "Yields successive lists of at most batch_size of the passed objects"
+    for start in xrange(0, len(objs), batch_size):
+        yield objs[start:start + batch_size]
+
+
+def default_batch_size(model, using):
+    """
+    Returns the number of instances of model that may be inserted by a single
+    statement on the passed database.
+    """
+    if connections[using].vendor == 'sqlite':
+        return max(1, SQLITE_MAX_VARIABLES // len(model._meta.fields))
+    return DEFAULT_BATCH_SIZE
+
+
+def queued_filter():
+    "Returns a Q object matching queued posts (i.e. publish date is future)"
+    return Q(date_published__gt=datetime.now())
+
+
+def past_filter():
+    "Returns a Q object matching past posts (i.e. publish date is past)"
+    return Q(date_published__lte=datetime.now())
+
+
+def private_filter():
+    "Returns a Q object matching private posts (i.e. either future or draft)"
+    return queued_filter() | Q(status='d')
+
+
+def public_filter():
+    "Returns a Q object matching public posts (i.e. both past and published)"
+    return past_filter() & Q(status='p')
 
 
 class PostManager(models.Manager):
@@ -77,11 +186,11 @@ class PostManager(models.Manager):
 
     def queued(self):
         "Returns queued posts (i.e. publish date is in the future)"
-        return self.get_query_set().filter(date_published__gt=datetime.now())
+        return self.get_query_set().filter(queued_filter())
 
     def past(self):
         "Returns past posts (i.e. publish date is in the past)"
-        return self.get_query_set().filter(date_published__lte=datetime.now())
+        return self.get_query_set().filter(past_filter())
 
     def status(self, status_code):
         "Convenience method for filtering objects by the status field."
@@ -97,10 +206,105 @@ class PostManager(models.Manager):
 
     def private(self):
         "Returns private posts (i.e. either future or draft)"
-        return self.get_query_set().filter(
-            Q(date_published__gt=datetime.now()) | Q(status='d')
-        )
+        return self.get_query_set().filter(private_filter())
 
     def public(self):
         "Returns public posts (i.e. those both past and published)"
         return self.published() & self.past()
+
+    def bulk_insert(self, objs, batch_size=None):
+        """
+        Inserts the passed objects with bulk_create(), at most batch_size per
+        statement.
+        """
+        batch_size = batch_size or default_batch_size(self.model, self.db)
+        for batch in batches(objs, batch_size):
+            self.bulk_create(batch)
+
+    def unique_slug(self, slug, taken):
+        """
+        Returns the passed slug, suffixed with a number if needed so that it is
+        not in the set of taken slugs, nor used by any Post or object of this
+        model. The returned slug is added to taken.
+        """
+        from tumblelog.models.base import Post
+        candidate, suffix = slug, 1
+        while candidate in taken or \
+            Post.objects.filter(slug=candidate).exists() or \
+            self.filter(slug=candidate).exists():
+            suffix += 1
+            ending = '-%d' % suffix
+            candidate = slug[:64 - len(ending)] + ending
+        taken.add(candidate)
+        return candidate
+
+    def prepare_posts(self, objs):
+        """
+        Fills in the fields that BasePostType.save() would: a slug generated
+        from the title, where none is set, the creation, modification and
+        publication dates, and the HTML of any markup fields. Slugs already in
+        use, whether by an existing post or an earlier one of objs, are made
+        unique by appending a number.
+        """
+        from tumblelog.models.base import Post
+        now = datetime.now()
+        for obj in objs:
+            obj.slug = obj.slug or slugify(obj.title)[:64]
+        existing = set()
+        for batch in batches([obj.slug for obj in objs], SQLITE_MAX_VARIABLES):
+            existing.update(Post.objects.filter(slug__in=batch) \
+                .values_list('slug', flat=True))
+            existing.update(self.filter(slug__in=batch) \
+                .values_list('slug', flat=True))
+        taken = set()
+        for obj in objs:
+            if obj.slug in existing or obj.slug in taken:
+                obj.slug = self.unique_slug(obj.slug, taken)
+            taken.add(obj.slug)
+            obj.date_added = now
+            obj.date_modified = now
+            if not obj.date_published:
+                obj.date_published = now
+            obj.render_markup()
+
+    def bulk_create_posts(self, objs, batch_size=None):
+        """
+        Creates many objects of a BasePostType subclass, along with their Post
+        objects, in a single transaction and a handful of statements. Unlike
+        bulk_create(), slugs and dates are assigned as save() would, and the
+        primary key of each object is set. Returns the list of objects.
+
+        Like bulk_create(), save() is not called and no signals are sent; in
+        particular, oEmbed post types are not retrieved until the next run of
+        the refresh_oembed command.
+        """
+        from tumblelog.cache import bump_generation
+        from tumblelog.models.base import Post
+        objs = list(objs)
+        if not objs:
+            return objs
+        self.prepare_posts(objs)
+        with atomic(using=self.db):
+            self.bulk_insert(objs, batch_size)
+            # Not every backend returns the primary keys of inserted rows, so
+            # look them up by slug
+            pks = {}
+            for batch in batches(objs, SQLITE_MAX_VARIABLES):
+                pks.update(self.filter(slug__in=[obj.slug for obj in batch]) \
+                    .values_list('slug', 'pk'))
+            for obj in objs:
+                obj.pk = pks[obj.slug]
+            Post.objects.mirror(objs, batch_size)
+        for obj in objs:
+            obj._tumblelog_state = obj.get_state()
+        bump_generation()
+        return objs
+
+    def mirror(self, objs, batch_size=None):
+        """
+        Creates the Post for each of the passed, saved post type objects, which
+        must not already have one. Used to create the Post objects deferred by
+        BasePostType.save(mirror=False).
+        """
+        with atomic(using=self.db):
+            self.bulk_insert([obj.get_mirror() for obj in objs], batch_size)
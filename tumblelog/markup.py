@@ -0,0 +1,29 @@
+"""
+Markup rendering for the fields named in a post type's
+TumblelogMeta.markup_fields.
+
+Each field is rendered when its object is saved, by the callable named by
+TUMBLELOG_MARKUP_RENDERER, and the resulting HTML is stored in the field's
+<name>_html counterpart, so that templates need not render it per request.
+A renderer is passed the field's text and returns HTML.
+"""
+from django.utils.html import linebreaks as linebreaks_html
+from django.utils.safestring import mark_safe
+
+from tumblelog.settings import MARKUP_RENDERER
+from tumblelog.util import import_attribute
+
+
+def linebreaks(text):
+    """
+    Default renderer, matching the linebreaks template filter: the text is
+    escaped, and line breaks are converted to <p> and <br /> tags.
+    """
+    return mark_safe(linebreaks_html(text, autoescape=True))
+
+
+def render_markup(text):
+    "Returns text rendered as HTML by the configured renderer"
+    if text is None:
+        return None
+    return import_attribute(MARKUP_RENDERER)(text)
@@ -9,13 +9,20 @@ from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import ValidationError
 from django.core.paginator import Paginator
 from django.db import models
+from django.db.models.fields.files import FieldFile
 from django.template.defaultfilters import slugify
 from django.utils.translation import ugettext as _
 
+from tumblelog import refresh, snapshots
+from tumblelog.cache import bump_generation, delete_fragments, \
+    get_oembed_response, oembed_cache_key, oembed_failed, \
+    set_oembed_failure, set_oembed_response
 from tumblelog.managers import PostManager
+from tumblelog.markup import render_markup
 from tumblelog.mixins import PostMetaMixin
-from tumblelog.settings import OEMBED_DEFAULT_CACHE_AGE, TEXTFIELD_HELP_TEXT, \
-    USE_TAGGIT
+from tumblelog.settings import OEMBED_DEFAULT_CACHE_AGE, OEMBED_ENDPOINTS, \
+    OEMBED_MAX_STALENESS, TEXTFIELD_HELP_TEXT, USE_SNAPSHOTS, USE_TAGGIT
+from tumblelog.util import atomic
 
 
 class TumblelogMeta(object):
@@ -73,6 +80,18 @@ class TumblelogMeta(object):
     actions_on_bottom = False
     actions_selection_counter = True
 
+    # Options used by tumblelog itself rather than the generated ModelAdmin
+    post_type_options = (
+        'select_related',
+        'prefetch_related',
+        'snapshot_fields',
+        'markup_fields',
+    )
+    select_related = ('author',)
+    prefetch_related = ()
+    snapshot_fields = None
+    markup_fields = ()
+
     def __init__(self, opts, **kwargs):
         if opts:
             opts = opts.__dict__.items()
@@ -102,6 +121,8 @@ class Post(PostMetaMixin, models.Model):
         help_text=_('Used to construct the post\'s URL'),
         unique=True,
     )
+    snapshot = models.TextField(_('Snapshot'), blank=True, null=True, \
+        editable=False)
 
     objects = PostManager()
 
@@ -118,12 +139,12 @@ class Post(PostMetaMixin, models.Model):
 
     @models.permalink
     def get_absolute_url(self):
-        return ('tumblelog:detail', [], {'slug': self.fields.slug})
+        return ('tumblelog:detail', [], {'slug': self.slug})
 
     @property
     def post_type_name(self):
         if self.fields:
-            return slugify(self.fields.__class__.__name__)
+            return self.fields.post_type_name
         return None
 
 
@@ -170,16 +191,47 @@ class BasePostType(PostMetaMixin, models.Model):
 
     __metaclass__ = PostTypeMetaclass
 
+    # Fields whose values are copied to the object's Post
+    mirrored_fields = (
+        'status',
+        'date_added',
+        'date_modified',
+        'date_published',
+        'slug',
+        'author',
+    )
+
     class Meta:
         abstract = True
         ordering = ['-date_published']
 
+    def __init__(self, *args, **kwargs):
+        super(BasePostType, self).__init__(*args, **kwargs)
+        self._tumblelog_state = self.get_state()
+
     def __unicode__(self):
         return self.title
 
     def get_absolute_url(self):
         return self.post.all()[0].get_absolute_url()
 
+    @classmethod
+    def generic_related_queryset(cls):
+        """
+        Returns the queryset used to bulk load objects of this post type when
+        they are attached to Post objects, following the relations declared in
+        TumblelogMeta.select_related and TumblelogMeta.prefetch_related (plus
+        tags, when django-taggit supports prefetching them).
+        """
+        meta = cls._tumblelog_meta
+        prefetch = list(meta.prefetch_related)
+        if USE_TAGGIT and TAGGIT_PREFETCH and 'tags' not in prefetch:
+            prefetch.append('tags')
+        queryset = cls._default_manager.select_related(*meta.select_related)
+        if prefetch:
+            queryset = queryset.prefetch_related(*prefetch)
+        return queryset
+
     def clean_fields(self, exclude):
         """
         Ensures that multiple posts do not share a slug.
@@ -208,24 +260,142 @@ class BasePostType(PostMetaMixin, models.Model):
         if errors:
             raise ValidationError(errors)
 
+    def get_state(self):
+        """
+        Returns the loaded values of the object's concrete fields, other than
+        date_modified, used to detect whether it has changed. Deferred fields
+        are not loaded.
+        """
+        state = {}
+        for field in self._meta.fields:
+            if field.attname in self.__dict__ and \
+                field.attname != 'date_modified':
+                value = self.__dict__[field.attname]
+                if isinstance(value, FieldFile):
+                    value = value.name
+                state[field.attname] = value
+        return state
+
+    def has_changed(self):
+        """
+        Boolean indicating whether the object is unsaved, or any of its fields
+        have changed since it was loaded or last saved.
+        """
+        return not self.pk or self.get_state() != self._tumblelog_state
+
     def save(self, *args, **kwargs):
         """
-        Overrides save method to either creates or updates the correspondant
-        Post object when object is saved.
+        Overrides save method to either create or update the corresponding
+        Post object in the same transaction. If nothing has changed since the
+        object was loaded, the Post is left untouched.
+
+        Bulk importers may pass mirror=False to defer this, and later call
+        mirror_post() or Post.objects.mirror().
         """
-        super(BasePostType, self).save(*args, **kwargs)
-        content_type = ContentType.objects.get_for_model(self)
-        post, created = Post.objects.get_or_create(
-            post_type=content_type,
-            object_id=self.id
+        mirror = kwargs.pop('mirror', True)
+        changed = self.has_changed()
+        if changed:
+            delete_fragments(self)
+            self.render_markup()
+        with atomic():
+            super(BasePostType, self).save(*args, **kwargs)
+            if mirror and changed:
+                self.mirror_post()
+        if changed:
+            bump_generation()
+        self._tumblelog_state = self.get_state()
+
+    def render_markup(self):
+        """
+        Renders each field named in TumblelogMeta.markup_fields with the
+        configured markup renderer, storing the HTML in its <name>_html field.
+        Returns a dictionary of the rendered values.
+        """
+        values = {}
+        for name in self._tumblelog_meta.markup_fields:
+            values['%s_html' % name] = render_markup(getattr(self, name))
+            setattr(self, '%s_html' % name, values['%s_html' % name])
+        return values
+
+    def get_mirror_values(self):
+        """
+        Returns a dictionary of the values copied from this object to its
+        Post, keyed by field name. Related objects are given by primary key,
+        so that they need not be loaded.
+        """
+        values = dict((name, getattr(self, self._meta.get_field(name).attname))
+            for name in self.mirrored_fields)
+        if USE_SNAPSHOTS:
+            values['snapshot'] = self.get_snapshot()
+        return values
+
+    def get_mirror(self):
+        "Returns a new, unsaved Post for this object"
+        post = Post(
+            post_type=ContentType.objects.get_for_model(self),
+            object_id=self.pk
         )
-        post.status = self.status
-        post.date_added = self.date_added
-        post.date_modified = self.date_modified
-        post.date_published = self.date_published
-        post.slug = self.slug
-        post.author = self.author
-        post.save()
+        for name, value in self.get_mirror_values().items():
+            setattr(post, Post._meta.get_field(name).attname, value)
+        return post
+
+    def mirror_post(self):
+        """
+        Creates or updates this object's Post. Updating an existing Post takes
+        a single statement; a Post is only inserted if none was updated.
+        """
+        content_type = ContentType.objects.get_for_model(self)
+        with atomic():
+            updated = Post.objects.filter(post_type=content_type, \
+                object_id=self.pk).update(**self.get_mirror_values())
+            if not updated:
+                self.get_mirror().save()
+
+    def get_snapshot(self):
+        """
+        Returns a serialized snapshot of the values needed to render this
+        object in list views and feeds, or None if the post type does not
+        declare TumblelogMeta.snapshot_fields.
+        """
+        fields = self._tumblelog_meta.snapshot_fields
+        if fields is None:
+            return None
+        data = {
+            'title': self.title,
+            'slug': self.slug,
+            'meta_description': self.meta_description,
+            'post_type_name': self.post_type_name,
+            'post_template': self.post_template,
+            'rss_template': self.rss_template,
+        }
+        for name in fields:
+            data[name] = getattr(self, name)
+        return snapshots.dumps(data)
+
+    def touch(self, **values):
+        """
+        Marks this object and its Post as modified, for use when data they
+        render changes without the object itself being saved (e.g. its related
+        objects, or data retrieved from a provider). Any passed field values
+        are written to the object in the same statement. Its cached fragments
+        and pages are invalidated and its snapshot is updated.
+        """
+        if not self.pk:
+            return
+        delete_fragments(self)
+        self.date_modified = values['date_modified'] = datetime.now()
+        self.__class__._default_manager.filter(pk=self.pk).update(**values)
+        mirrored = {'date_modified': self.date_modified}
+        if USE_SNAPSHOTS:
+            mirrored['snapshot'] = self.get_snapshot()
+        content_type = ContentType.objects.get_for_model(self)
+        Post.objects.filter(post_type=content_type, object_id=self.pk) \
+            .update(**mirrored)
+        bump_generation()
+
+    @property
+    def post_type_name(self):
+        return slugify(self.__class__.__name__)
 
     @property
     def post_template(self):
@@ -240,10 +410,49 @@ class BasePostType(PostMetaMixin, models.Model):
 
 
 # Add the django-taggit manager, if taggit is installed
+TAGGIT_PREFETCH = False
 if USE_TAGGIT:
-    from taggit.managers import TaggableManager
+    from taggit.managers import TaggableManager, _TaggableManager
     taggit_manager = TaggableManager()
     taggit_manager.contribute_to_class(BasePostType, 'tags')
+    TAGGIT_PREFETCH = hasattr(_TaggableManager, 'get_prefetch_query_set')
+
+
+def invalidate_on_delete(sender, instance, **kwargs):
+    """
+    Deletes the cached fragments of a deleted post type object, and
+    invalidates cached pages when a Post or post type object is deleted.
+    Connected to post_delete, rather than done in delete(), as
+    QuerySet.delete() (e.g. the admin's delete action) does not call it.
+    """
+    if isinstance(instance, BasePostType):
+        delete_fragments(instance)
+        bump_generation()
+    elif isinstance(instance, Post):
+        bump_generation()
+models.signals.post_delete.connect(invalidate_on_delete, \
+    dispatch_uid='tumblelog.models.base.invalidate_on_delete')
+
+
+def touch_tagged_object(sender, instance, **kwargs):
+    """
+    Marks a post type object as modified when one of its tags is added or
+    removed. Tags are saved after the object itself (e.g. by the admin's
+    save_m2m()), so a save in which only they changed leaves its Post, cached
+    fragments and pages untouched.
+    """
+    content_type = ContentType.objects.get_for_id(instance.content_type_id)
+    model = content_type.model_class()
+    if model is None or not issubclass(model, BasePostType):
+        return
+    try:
+        model._default_manager.get(pk=instance.object_id).touch()
+    except model.DoesNotExist:
+        pass
+if USE_TAGGIT:
+    for signal in (models.signals.post_save, models.signals.post_delete):
+        signal.connect(touch_tagged_object, sender=taggit_manager.through, \
+            dispatch_uid='tumblelog.models.base.touch_tagged_object')
 
 
 class BaseOembedPostType(BasePostType):
@@ -266,6 +475,8 @@ class BaseOembedPostType(BasePostType):
         default=OEMBED_DEFAULT_CACHE_AGE)
     date_updated = models.DateTimeField(_('Last Retrieved'), null=True, \
         blank=True, editable=True)
+    date_expires = models.DateTimeField(_('Expires'), null=True, \
+        blank=True, editable=False, db_index=True)
 
     oembed_map = (
         'version',
@@ -279,16 +490,69 @@ class BaseOembedPostType(BasePostType):
         abstract = True
 
     def __init__(self, *args, **kwargs):
+        """
+        Serves stored oEmbed data as-is; expired objects are refreshed by the
+        refresh_oembed command, which finds them by their indexed date_expires,
+        instead of being fetched during construction. Data older than
+        TUMBLELOG_OEMBED_MAX_STALENESS seconds past its expiry is updated in
+        memory only (see oembed_update_stale()), and never while refreshing is
+        suspended (i.e. when loaded by the refresh_oembed command).
+        """
         super(BaseOembedPostType, self).__init__(*args, **kwargs)
-        if self.pk:
-            expiry = timedelta(seconds=self.cache_age) + self.date_updated
-            if datetime.now() > expiry:
-                self.oembed_update()
+        if self.pk and not refresh.is_suspended() and \
+            self.oembed_is_too_stale:
+            self.oembed_update_stale()
+
+    @property
+    def oembed_expires(self):
+        "Datetime after which the stored provider data should be refreshed"
+        if self.date_updated:
+            seconds = int(self.cache_age)
+            return self.date_updated + timedelta(seconds=seconds)
+        return None
+
+    @property
+    def oembed_is_stale(self):
+        "Boolean indicating whether the stored provider data has expired"
+        expires = self.oembed_expires
+        return expires is None or datetime.now() > expires
+
+    @property
+    def oembed_is_too_stale(self):
+        """
+        Boolean indicating whether the stored provider data has been expired
+        for longer than TUMBLELOG_OEMBED_MAX_STALENESS permits. Objects that
+        have never been retrieved are not.
+        """
+        if OEMBED_MAX_STALENESS is None:
+            return False
+        expires = self.oembed_expires
+        if expires is None:
+            # Never retrieved (e.g. imported); left to refresh_oembed
+            return False
+        limit = expires + timedelta(seconds=OEMBED_MAX_STALENESS)
+        return datetime.now() > limit
+
+    @property
+    def oembed_fields(self):
+        """
+        Names of the concrete fields populated from the provider response.
+        """
+        names = set(field.attname for field in self._meta.fields)
+        fields = ['date_updated', 'date_expires']
+        for mapping in self.oembed_map:
+            try:
+                prop, field = mapping
+            except ValueError:
+                field = mapping
+            if field in names and field not in fields:
+                fields.append(field)
+        return fields
 
     def oembed_consumer(self):
         consumer = oembed.OEmbedConsumer()
         endpoint = oembed.OEmbedEndpoint(
-            self.oembed_endpoint,
+            OEMBED_ENDPOINTS.get(self.oembed_endpoint, self.oembed_endpoint),
             self.oembed_schema,
         )
         consumer.addEndpoint(endpoint)
@@ -303,18 +567,86 @@ class BaseOembedPostType(BasePostType):
         return {}
 
     def oembed_update(self):
-        self.date_updated = datetime.now()
+        """
+        Maps a fresh provider response onto the object's fields. The retrieval
+        and expiry dates only advance when the provider responds, so a failed
+        fetch is retried rather than recorded as fresh data.
+        """
         response = self.oembed_retrieve()
-        self.oembed_map_values(response)
+        if response is not None:
+            self.date_updated = datetime.now()
+            self.oembed_map_values(response)
+            self.date_expires = self.oembed_expires
+        return response
 
-    def oembed_retrieve(self, suppress_http_errors=True):
-        consumer = self.oembed_consumer()
+    def oembed_update_stale(self):
+        """
+        Updates too-stale provider data while the object is loaded, without
+        writing to the database or invalidating any cache, so that reads
+        never write; the refresh_oembed command persists it, finding the
+        response in the shared cache. A failed fetch is remembered for
+        TUMBLELOG_OEMBED_FAILURE_TIMEOUT seconds, so that an unresponsive
+        provider is not queried by every request. Returns the response, or
+        None.
+        """
+        key = self.oembed_cache_key
+        if oembed_failed(key):
+            return None
         try:
-            return consumer.embed(self.oembed_resource, 'json', \
-                **self.oembed_endpoint_params)
-        except HTTPError, e:
-            if not suppress_http_errors:
-                raise e
+            response = self.oembed_update()
+        except (IOError, ValueError):
+            response = None
+        if response is None:
+            set_oembed_failure(key)
+        return response
+
+    def oembed_refresh(self):
+        """
+        Retrieves fresh data from the provider and persists only the fields
+        derived from it, marking the object and its Post as modified. Nothing
+        is written if the provider does not respond. Returns a boolean
+        indicating whether it responded.
+        """
+        response = self.oembed_update()
+        if response is None:
+            return False
+        self.touch(**dict((name, getattr(self, name)) for name in \
+            self.oembed_fields))
+        return True
+
+    @property
+    def oembed_cache_key(self):
+        return oembed_cache_key(self.oembed_endpoint, self.oembed_resource, \
+            self.oembed_endpoint_params)
+
+    def oembed_retrieve(self, suppress_http_errors=True):
+        """
+        Returns the provider's response for this resource as a dict, from the
+        instance's memoized response or the shared response cache where
+        possible.
+        """
+        key = self.oembed_cache_key
+        memo_key, response = getattr(self, '_oembed_response', (None, None))
+        if memo_key == key:
+            return response
+
+        response = get_oembed_response(key)
+        if response is None:
+            consumer = self.oembed_consumer()
+            try:
+                response = consumer.embed(self.oembed_resource, 'json', \
+                    **self.oembed_endpoint_params).getData()
+            except HTTPError, e:
+                if not suppress_http_errors:
+                    raise e
+                return None
+            set_oembed_response(key, response)
+
+        # Memoize the response on the instance, so that validation and any
+        # subsequent saves share a single fetch until the resource or
+        # endpoint parameters change.
+        self._oembed_response = (key, response)
+        return response
 
     def oembed_map_values(self, response):
         for mapping in self.oembed_map:
@@ -323,7 +655,7 @@ class BaseOembedPostType(BasePostType):
             except ValueError:
                 prop, field = mapping, mapping
             finally:
-                if hasattr(self, field):
+                if hasattr(self, field) and prop in response:
                     value = self.oembed_clean_value(field, response[prop])
                     setattr(self, field, value)
 
@@ -47,6 +47,10 @@ class Rdio(BaseOembedRich):
             'slug',
             'caption',
         ]
+        snapshot_fields = (
+            'embed',
+            'caption',
+        )
         list_filter = (
             filters.PubliclyVisibleListFilter,
             filters.PublicationDateListFilter,
@@ -201,6 +205,10 @@ class SoundCloud(BaseOembedRich):
             'soundcloud_title',
             'soundcloud_description',
         ]
+        snapshot_fields = (
+            'embed',
+            'caption',
+        )
 
     oembed_endpoint = 'http://soundcloud.com/oembed'
     oembed_schema = [
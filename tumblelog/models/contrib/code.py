@@ -8,6 +8,7 @@ from django.utils.translation import ugettext as _
 from tumblelog import actions, filters
 from tumblelog.choices import CODE_LANGUAGES
 from tumblelog.fields import OEmbedURLField
+from tumblelog.highlighting import highlight_code
 from tumblelog.models.base import BasePostType, BaseOembedRich
 from tumblelog.settings import TEXTFIELD_HELP_TEXT
 
@@ -23,6 +24,8 @@ class CodeSnippet(models.Model):
         choices=CODE_LANGUAGES,
     )
     code = models.TextField(_('Code'))
+    highlighted = models.TextField(_('Highlighted Code'), null=True, \
+        blank=True, editable=False)
 
     class Meta:
         app_label = 'tumblelog'
@@ -32,6 +35,26 @@ class CodeSnippet(models.Model):
     def __unicode__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        self.highlight()
+        super(CodeSnippet, self).save(*args, **kwargs)
+        self.post.touch()
+
+    def highlight(self):
+        """
+        Sets the highlighted field to the snippet's code, highlighted as HTML.
+        Returns a boolean indicating whether its value changed.
+        """
+        highlighted = highlight_code(self.code, self.language)
+        changed = highlighted != self.highlighted
+        self.highlighted = highlighted
+        return changed
+
+    def delete(self, *args, **kwargs):
+        post = self.post
+        super(CodeSnippet, self).delete(*args, **kwargs)
+        post.touch()
+
 
 class CodeSnippetInline(admin.StackedInline):
     model = CodeSnippet
@@ -83,6 +106,9 @@ class Code(BasePostType):
             filters.StatusListFilter,
             'author',
         )
+        prefetch_related = (
+            'codesnippet_set',
+        )
         prepopulated_fields = {
             'slug': ('title',)
         }
@@ -91,6 +117,10 @@ class Code(BasePostType):
             'slug',
             'caption',
         ]
+        snapshot_fields = (
+            'caption',
+            'snippets',
+        )
 
     @property
     def snippets(self):
@@ -150,6 +180,10 @@ class Gist(BaseOembedRich):
             'slug',
             'caption',
         ]
+        snapshot_fields = (
+            'javascript_embed',
+            'caption',
+        )
 
     oembed_endpoint = 'https://github.com/api/oembed'
     oembed_schema = [
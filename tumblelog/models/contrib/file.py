@@ -1,3 +1,5 @@
+import hashlib
+import mimetypes
 import re
 
 from django.db import models
@@ -26,6 +28,24 @@ class File(BasePostType):
         null=True,
         help_text=TEXTFIELD_HELP_TEXT
     )
+    file_size = models.BigIntegerField(_('File Size'),
+        blank=True,
+        null=True,
+        editable=False
+    )
+    content_type = models.CharField(_('Content Type'),
+        max_length=128,
+        blank=True,
+        null=True,
+        editable=False
+    )
+    content_hash = models.CharField(_('Content Hash'),
+        max_length=64,
+        blank=True,
+        null=True,
+        editable=False,
+        help_text=_('SHA-256 digest of the file')
+    )
 
     class Meta:
         app_label = 'tumblelog'
@@ -71,6 +91,49 @@ class File(BasePostType):
             'slug',
             'description',
         ]
+        snapshot_fields = (
+            'file_file',
+            'file_link_text',
+            'file_size',
+            'content_type',
+            'description',
+        )
+
+    def save(self, *args, **kwargs):
+        """
+        Stores the file's size, content type and hash when a new file is
+        uploaded, so that they are never read from the file when it is
+        downloaded.
+        """
+        if self.file_file and (not self.content_hash or \
+            self.file_file.name != self._tumblelog_state.get('file_file')):
+            self.store_file_metadata()
+        super(File, self).save(*args, **kwargs)
+
+    def store_file_metadata(self):
+        """
+        Sets the file_size, content_type and content_hash fields from the
+        uploaded file, reading it once. The file is first stored, if it was
+        just uploaded.
+        """
+        uploaded_type = None
+        if not self.file_file._committed:
+            uploaded_type = getattr(self.file_file.file, 'content_type', None)
+            self.file_file.save(self.file_file.name, self.file_file, \
+                save=False)
+        digest = hashlib.sha256()
+        size = 0
+        self.file_file.open('rb')
+        try:
+            for chunk in self.file_file.chunks():
+                digest.update(chunk)
+                size += len(chunk)
+        finally:
+            self.file_file.close()
+        self.file_size = size
+        self.content_hash = digest.hexdigest()
+        self.content_type = mimetypes.guess_type(self.file_file.name)[0] or \
+            uploaded_type or 'application/octet-stream'
 
     def get_filename(self):
         """
@@ -78,7 +141,7 @@ class File(BasePostType):
         """
         if self.file_file:
             try:
-                return re.search(r'([^\/]+)$', self.file_file).groups()[0]
+                return re.search(r'([^\/]+)$', self.file_file.name).groups()[0]
             except AttributeError:
                 pass
         return None
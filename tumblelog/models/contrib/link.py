@@ -63,3 +63,8 @@ class Link(BasePostType):
             'slug',
             'caption',
         ]
+        snapshot_fields = (
+            'link',
+            'link_text',
+            'caption',
+        )
@@ -1,7 +1,7 @@
 from django.db import models
 from django.utils.translation import ugettext as _
 
-from tumblelog import actions, filters
+from tumblelog import actions, filters, images
 from tumblelog.choices import FLICKR_SIZE_CHOICES
 from tumblelog.fields import OEmbedURLField
 from tumblelog.models.base import BasePostType, BaseOembedPhoto
@@ -12,7 +12,26 @@ class Image(BasePostType):
     """
     Post type for an image.
     """
-    image = models.ImageField(_('Image'), upload_to='tumblelog/image')
+    image = models.ImageField(_('Image'),
+        upload_to='tumblelog/image',
+        width_field='width',
+        height_field='height'
+    )
+    width = models.PositiveIntegerField(_('Width'),
+        blank=True,
+        null=True,
+        editable=False
+    )
+    height = models.PositiveIntegerField(_('Height'),
+        blank=True,
+        null=True,
+        editable=False
+    )
+    derivatives = models.TextField(_('Derivatives'),
+        blank=True,
+        null=True,
+        editable=False
+    )
     caption = models.TextField(_('Caption'),
         blank=True,
         null=True,
@@ -59,6 +78,74 @@ class Image(BasePostType):
             'slug',
             'caption',
         ]
+        snapshot_fields = (
+            'image',
+            'width',
+            'height',
+            'srcset',
+            'webp_srcset',
+            'caption',
+        )
+
+    def save(self, *args, **kwargs):
+        """
+        Generates the image's derivatives when a new image is uploaded, so that
+        they are saved with it.
+        """
+        if self.image and (not self.derivatives or \
+            self.image.name != self._tumblelog_state.get('image')):
+            self.generate_derivatives()
+        super(Image, self).save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        storage = self.image.storage
+        derivatives = self.get_derivatives()
+        super(Image, self).delete(*args, **kwargs)
+        images.delete_derivatives(storage, derivatives)
+
+    def generate_derivatives(self, pool=None, workers=None):
+        """
+        Stores the image's dimensions and resized copies of it, replacing any
+        previous copies. The image is first stored, if it was just uploaded.
+        """
+        if not self.image._committed:
+            self.image.save(self.image.name, self.image, save=False)
+        if self.width is None or self.height is None:
+            self._meta.get_field('image').update_dimension_fields(self, \
+                force=True)
+        previous = self.get_derivatives()
+        derivatives = images.generate_derivatives(self.image, self.width, \
+            pool, workers)
+        names = set(derivative['name'] for derivative in derivatives)
+        images.delete_derivatives(self.image.storage, [derivative for \
+            derivative in previous if derivative['name'] not in names])
+        self.derivatives = images.dumps(derivatives)
+
+    def get_derivatives(self):
+        """
+        Returns a list of dictionaries holding the name, width, height and
+        format of each resized copy of the image.
+        """
+        return images.loads(self.derivatives)
+
+    @property
+    def srcset(self):
+        """
+        Returns a srcset attribute value listing the JPEG copies of the image
+        and the image itself.
+        """
+        if not self.image:
+            return ''
+        return images.srcset(self.image.storage, self.get_derivatives(), \
+            'jpeg', self.width, self.image.url)
+
+    @property
+    def webp_srcset(self):
+        "Returns a srcset attribute value listing the WebP copies of the image"
+        if not self.image:
+            return ''
+        return images.srcset(self.image.storage, self.get_derivatives(), \
+            'webp')
 
 
 class Flickr(BaseOembedPhoto):
@@ -129,6 +216,11 @@ class Flickr(BaseOembedPhoto):
             'slug',
             'caption',
         ]
+        snapshot_fields = (
+            'flickr_url',
+            'image_url',
+            'caption',
+        )
 
     oembed_endpoint = 'http://www.flickr.com/services/oembed'
     oembed_schema = [
@@ -213,6 +305,11 @@ class Instagram(BaseOembedPhoto):
             'slug',
             'caption',
         ]
+        snapshot_fields = (
+            'instagram_url',
+            'image_url',
+            'caption',
+        )
 
     oembed_endpoint = 'http://api.instagram.com/oembed'
     oembed_schema = [
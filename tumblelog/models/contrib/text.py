@@ -11,6 +11,8 @@ class TextSnippet(BasePostType):
     Post type for a small blurb of text
     """
     body = models.TextField(_('Body'), help_text=TEXTFIELD_HELP_TEXT)
+    body_html = models.TextField(_('Body HTML'), null=True, blank=True, \
+        editable=False)
 
     class Meta:
         app_label = 'tumblelog'
@@ -44,6 +46,9 @@ class TextSnippet(BasePostType):
             filters.StatusListFilter,
             'author',
         )
+        markup_fields = (
+            'body',
+        )
         prepopulated_fields = {
             'slug': ('title',)
         }
@@ -52,6 +57,10 @@ class TextSnippet(BasePostType):
             'slug',
             'body',
         ]
+        snapshot_fields = (
+            'body',
+            'body_html',
+        )
 
 
 class Article(BasePostType):
@@ -60,6 +69,10 @@ class Article(BasePostType):
     """
     excerpt = models.TextField(_('Excerpt'), help_text=TEXTFIELD_HELP_TEXT)
     body = models.TextField(_('Body'), help_text=TEXTFIELD_HELP_TEXT)
+    excerpt_html = models.TextField(_('Excerpt HTML'), null=True, blank=True, \
+        editable=False)
+    body_html = models.TextField(_('Body HTML'), null=True, blank=True, \
+        editable=False)
 
     class Meta:
         app_label = 'tumblelog'
@@ -93,6 +106,10 @@ class Article(BasePostType):
             filters.StatusListFilter,
             'author',
         )
+        markup_fields = (
+            'excerpt',
+            'body',
+        )
         prepopulated_fields = {
             'slug': ('title',)
         }
@@ -102,3 +119,9 @@ class Article(BasePostType):
             'body',
             'excerpt',
         ]
+        snapshot_fields = (
+            'excerpt',
+            'excerpt_html',
+            'body',
+            'body_html',
+        )
@@ -87,6 +87,10 @@ class Tweet(BaseOembedRich):
             'slug',
             'caption',
         ]
+        snapshot_fields = (
+            'embed',
+            'caption',
+        )
 
     oembed_endpoint = 'https://api.twitter.com/1/statuses/oembed.json'
     oembed_schema = [
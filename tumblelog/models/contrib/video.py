@@ -85,6 +85,10 @@ class YouTube(BaseOembedVideoWithThumbnail):
             'slug',
             'caption',
         ]
+        snapshot_fields = (
+            'embed',
+            'caption',
+        )
 
     oembed_endpoint = 'http://www.youtube.com/oembed'
     oembed_schema = [
@@ -180,6 +184,10 @@ class Vimeo(BaseOembedVideoWithThumbnail):
             'slug',
             'caption',
         ]
+        snapshot_fields = (
+            'embed',
+            'caption',
+        )
 
     oembed_endpoint = 'http://vimeo.com/api/oembed.json'
     oembed_schema = [
@@ -0,0 +1,128 @@
+import base64
+from datetime import datetime
+
+from django.db.models import Q
+
+CURSOR_DATE_FORMAT = '%Y-%m-%dT%H:%M:%S.%f'
+
+
+class InvalidCursor(Exception):
+    pass
+
+
+def encode_cursor(obj, direction):
+    """
+    Returns an opaque cursor pointing either after ('n') or before ('p') the
+    passed object's position in the (date_published, id) ordering.
+    """
+    raw = '%s|%d|%s' % (
+        obj.date_published.strftime(CURSOR_DATE_FORMAT),
+        obj.pk,
+        direction,
+    )
+    return base64.urlsafe_b64encode(raw).rstrip('=')
+
+
+def decode_cursor(cursor):
+    "Returns a (date_published, id, direction) tuple for the passed cursor"
+    try:
+        cursor = str(cursor)
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        date_published, pk, direction = raw.split('|')
+        if direction not in ('n', 'p'):
+            raise ValueError
+        return (
+            datetime.strptime(date_published, CURSOR_DATE_FORMAT),
+            int(pk),
+            direction,
+        )
+    except (TypeError, ValueError, UnicodeEncodeError):
+        raise InvalidCursor(cursor)
+
+
+class CursorPage(object):
+    """
+    A single page of results, exposing the same has_next(), has_previous() and
+    has_other_pages() methods as Django's Page, plus the cursors needed to
+    link to the adjacent pages.
+    """
+
+    def __init__(self, object_list, has_next, has_previous):
+        self.object_list = object_list
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __repr__(self):
+        return '<Page of %d>' % len(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self._has_next or self._has_previous
+
+    @property
+    def next_cursor(self):
+        if self._has_next and self.object_list:
+            return encode_cursor(self.object_list[-1], 'n')
+        return None
+
+    @property
+    def previous_cursor(self):
+        if self._has_previous and self.object_list:
+            return encode_cursor(self.object_list[0], 'p')
+        return None
+
+
+class CursorPaginator(object):
+    """
+    Paginates a queryset by seeking on (date_published, id), newest first,
+    rather than with OFFSET. Never counts the queryset, so the cost of fetching
+    a page does not depend on how deep into the archive it is.
+    """
+
+    def __init__(self, object_list, per_page):
+        self.object_list = object_list
+        self.per_page = int(per_page)
+
+    def page(self, cursor=None):
+        """
+        Returns the CursorPage starting at the passed cursor, or the first
+        page if no cursor is passed. Raises InvalidCursor if the cursor cannot
+        be decoded.
+        """
+        queryset = self.object_list
+        if not cursor:
+            queryset = queryset.order_by('-date_published', '-id')
+            objects = list(queryset[:self.per_page + 1])
+            return CursorPage(objects[:self.per_page], \
+                len(objects) > self.per_page, False)
+
+        date_published, pk, direction = decode_cursor(cursor)
+        if direction == 'n':
+            queryset = queryset.filter(
+                Q(date_published__lt=date_published) |
+                Q(date_published=date_published, id__lt=pk)
+            ).order_by('-date_published', '-id')
+            objects = list(queryset[:self.per_page + 1])
+            return CursorPage(objects[:self.per_page], \
+                len(objects) > self.per_page, True)
+        else:
+            queryset = queryset.filter(
+                Q(date_published__gt=date_published) |
+                Q(date_published=date_published, id__gt=pk)
+            ).order_by('date_published', 'id')
+            objects = list(queryset[:self.per_page + 1])
+            has_previous = len(objects) > self.per_page
+            objects = objects[:self.per_page]
+            objects.reverse()
+            return CursorPage(objects, True, has_previous)
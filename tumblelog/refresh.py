@@ -0,0 +1,254 @@
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from itertools import chain, izip_longest
+from multiprocessing.pool import ThreadPool
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Q, get_models
+
+from tumblelog.cache import bump_generation, object_fragment_keys
+from tumblelog.settings import OEMBED_RATE_LIMITS, USE_SNAPSHOTS
+
+_state = threading.local()
+
+
+@contextmanager
+def suspended():
+    """
+    Context manager within which oEmbed post types are constructed without
+    the blocking refresh of BaseOembedPostType.__init__, so that objects
+    loaded for a Refresher are only fetched by its worker threads.
+    """
+    _state.suspended = getattr(_state, 'suspended', 0) + 1
+    try:
+        yield
+    finally:
+        _state.suspended -= 1
+
+
+def is_suspended():
+    "Boolean indicating whether refreshing on construction is suspended"
+    return bool(getattr(_state, 'suspended', 0))
+
+
+def interleave(objs):
+    """
+    Returns the passed objects reordered round-robin by endpoint, so that
+    consecutive requests go to different providers.
+    """
+    grouped = {}
+    for obj in objs:
+        grouped.setdefault(obj.oembed_endpoint, []).append(obj)
+    return [obj for obj in chain(*izip_longest(*grouped.values())) if \
+        obj is not None]
+
+
+def oembed_models():
+    "Returns each installed, concrete subclass of BaseOembedPostType"
+    from tumblelog.models.base import BaseOembedPostType
+    return [model for model in get_models() if \
+        issubclass(model, BaseOembedPostType)]
+
+
+def expired(model, now=None):
+    """
+    Returns a queryset of the model's objects whose provider data has expired,
+    using the indexed date_expires column. Objects that have never been
+    retrieved are included.
+    """
+    now = now or datetime.now()
+    return model._default_manager.filter(
+        Q(date_expires__lte=now) | Q(date_expires__isnull=True)
+    )
+
+
+class EndpointLimiter(object):
+    """
+    Context manager bounding both the number of concurrent requests to, and
+    the rate of requests sent to, a single oEmbed endpoint.
+    """
+
+    def __init__(self, concurrency=2, rate=None):
+        self.semaphore = threading.BoundedSemaphore(concurrency)
+        self.interval = 1.0 / rate if rate else 0
+        self.lock = threading.Lock()
+        self.next_slot = 0
+
+    def __enter__(self):
+        self.semaphore.acquire()
+        if self.interval:
+            with self.lock:
+                now = time.time()
+                delay = self.next_slot - now
+                self.next_slot = max(now, self.next_slot) + self.interval
+            if delay > 0:
+                time.sleep(delay)
+        return self
+
+    def __exit__(self, *exc_info):
+        self.semaphore.release()
+
+
+class Refresher(object):
+    """
+    Refreshes oEmbed post types through a bounded pool of threads, limiting
+    the concurrency and rate of requests to each endpoint separately, and
+    writes the results back in batched transactions.
+
+    Per-endpoint limits may be set with TUMBLELOG_OEMBED_RATE_LIMITS; any
+    endpoint not listed there uses the concurrency and rate passed here.
+    """
+
+    def __init__(self, workers=8, concurrency=2, rate=None, batch_size=100):
+        self.workers = workers
+        self.concurrency = concurrency
+        self.rate = rate
+        self.batch_size = batch_size
+        self.limiters = {}
+        self.stats = {
+            'refreshed': 0,
+            'failed': 0,
+            'elapsed': 0.0,
+            'endpoints': {},
+        }
+
+    def limiter(self, endpoint):
+        if endpoint not in self.limiters:
+            limits = OEMBED_RATE_LIMITS.get(endpoint, {})
+            self.limiters[endpoint] = EndpointLimiter(
+                limits.get('concurrency', self.concurrency),
+                limits.get('rate', self.rate),
+            )
+        return self.limiters[endpoint]
+
+    def fetch(self, obj):
+        """
+        Retrieves fresh provider data for a single object. Runs in a worker
+        thread, so must not touch the database. Any error, whether from the
+        network, the provider or its response, is counted as a failure of
+        that object alone.
+        """
+        try:
+            with self.limiter(obj.oembed_endpoint):
+                return obj, obj.oembed_update() is not None
+        except Exception:
+            return obj, False
+
+    def write(self, results):
+        """
+        Persists the oEmbed-derived fields of each successful result in a
+        single transaction, marking the objects and their Posts as modified
+        as touch() does, but for the whole round at once: the Posts of each
+        post type are updated with one statement (unless snapshots are
+        used), cached fragments are deleted with one delete_many(), and the
+        cache generation is bumped once.
+        """
+        from tumblelog.models.base import Post
+        objs = [obj for obj, success in results if success]
+        if not objs:
+            return
+        now = datetime.now()
+        keys = []
+        grouped = {}
+        with transaction.commit_on_success():
+            for obj in objs:
+                keys.extend(object_fragment_keys(obj))
+                values = dict((name, getattr(obj, name)) for name in \
+                    obj.oembed_fields)
+                obj.date_modified = values['date_modified'] = now
+                obj.__class__._default_manager.filter(pk=obj.pk) \
+                    .update(**values)
+                grouped.setdefault(obj.__class__, []).append(obj)
+            for model, model_objs in grouped.items():
+                posts = Post.objects.filter(
+                    post_type=ContentType.objects.get_for_model(model))
+                if USE_SNAPSHOTS:
+                    for obj in model_objs:
+                        posts.filter(object_id=obj.pk).update(
+                            date_modified=now, snapshot=obj.get_snapshot())
+                else:
+                    posts.filter(object_id__in=[obj.pk for obj in \
+                        model_objs]).update(date_modified=now)
+        cache.delete_many(keys)
+        bump_generation()
+
+    def record(self, results):
+        for obj, success in results:
+            counts = self.stats['endpoints'].setdefault(obj.oembed_endpoint, {
+                'refreshed': 0,
+                'failed': 0,
+            })
+            key = success and 'refreshed' or 'failed'
+            counts[key] += 1
+            self.stats[key] += 1
+
+    def run(self, querysets):
+        """
+        Refreshes the objects in each of the passed querysets. Returns the
+        stats of the run.
+        """
+        return self.refresh([(qs.model, list(qs.values_list('pk', \
+            flat=True))) for qs in querysets])
+
+    def refresh(self, pending):
+        """
+        Refreshes the objects with the passed primary keys, given as a list of
+        (model, pks) tuples. Each round loads one batch of every model, orders
+        it round-robin by endpoint and hands objects to the threads one at a
+        time, so that a slow or rate-limited endpoint only occupies the
+        threads waiting on it. Each round is written back in a single
+        transaction.
+        """
+        started = time.time()
+        pool = ThreadPool(self.workers)
+        try:
+            while any(pks for model, pks in pending):
+                objs = []
+                with suspended():
+                    for model, pks in pending:
+                        batch, pks[:] = pks[:self.batch_size], \
+                            pks[self.batch_size:]
+                        if batch:
+                            objs.extend(model._default_manager.filter(
+                                pk__in=batch))
+                results = list(pool.imap_unordered(self.fetch, \
+                    interleave(objs)))
+                self.write(results)
+                self.record(results)
+        finally:
+            pool.close()
+            pool.join()
+        self.stats['elapsed'] = time.time() - started
+        return self.stats
+
+
+def drain(limit=None, **kwargs):
+    """
+    Refreshes up to limit expired objects in total, across every oEmbed post
+    type, starting with those that have never been retrieved or expired
+    longest ago. Expired objects are found with the indexed date_expires
+    column, so no separate queue is kept. Any keyword arguments are passed to
+    Refresher. Returns its stats.
+    """
+    now = datetime.now()
+    entries = []
+    for model in oembed_models():
+        # Queried separately, since databases disagree on where NULLs sort
+        # (e.g. last in ascending order on PostgreSQL)
+        never = model._default_manager.filter(date_expires__isnull=True) \
+            .values_list('pk', flat=True)[:limit]
+        entries.extend((datetime.min, model, pk) for pk in never)
+        expiries = model._default_manager.filter(date_expires__lte=now) \
+            .order_by('date_expires').values_list('date_expires', 'pk')[:limit]
+        entries.extend((date_expires, model, pk) for date_expires, pk in \
+            expiries)
+    entries.sort(key=lambda entry: entry[0])
+
+    grouped = {}
+    for date_expires, model, pk in entries[:limit]:
+        grouped.setdefault(model, []).append(pk)
+    return Refresher(**kwargs).refresh(grouped.items())
@@ -9,7 +9,18 @@ POST_TYPES = getattr(settings, 'TUMBLELOG_POST_TYPES', [
     'tumblelog.contrib.photo.Image',
 ])
 POSTS_PER_PAGE = getattr(settings, 'TUMBLELOG_POSTS_PER_PAGE', 10)
+CURSOR_PAGINATION = getattr(settings, 'TUMBLELOG_CURSOR_PAGINATION', False)
 EDIT_META = getattr(settings, 'TUMBLELOG_EDIT_META', True)
+MARKUP_RENDERER = getattr(settings, 'TUMBLELOG_MARKUP_RENDERER', \
+    'tumblelog.markup.linebreaks')
+USE_SNAPSHOTS = getattr(settings, 'TUMBLELOG_USE_SNAPSHOTS', False)
+CACHE_FRAGMENTS = getattr(settings, 'TUMBLELOG_CACHE_FRAGMENTS', False)
+FRAGMENT_CACHE_TIMEOUT = getattr(settings, \
+    'TUMBLELOG_FRAGMENT_CACHE_TIMEOUT', 86400)
+CACHE_PAGES = getattr(settings, 'TUMBLELOG_CACHE_PAGES', False)
+PAGE_CACHE_TIMEOUT = getattr(settings, 'TUMBLELOG_PAGE_CACHE_TIMEOUT', 600)
+PAGE_CACHE_GRACE = getattr(settings, 'TUMBLELOG_PAGE_CACHE_GRACE', 60)
+IMPORT_MAPPER = getattr(settings, 'TUMBLELOG_IMPORT_MAPPER', None)
 
 # Should we use django-taggit?
 TAGGIT_INSTALLED = 'taggit' in settings.INSTALLED_APPS
@@ -18,10 +29,28 @@ USE_TAGGIT = getattr(settings, 'TUMBLELOG_USE_TAGGIT', TAGGIT_INSTALLED)
 # Settings for tumblelog.contrib post types
 OEMBED_DEFAULT_CACHE_AGE = getattr(settings, \
     'TUMBLELOG_OEMBED_DEFAULT_CACHE_AGE', 86400)
+OEMBED_MAX_STALENESS = getattr(settings, 'TUMBLELOG_OEMBED_MAX_STALENESS', \
+    None)
+OEMBED_FAILURE_TIMEOUT = getattr(settings, \
+    'TUMBLELOG_OEMBED_FAILURE_TIMEOUT', 300)
+OEMBED_ENDPOINTS = getattr(settings, 'TUMBLELOG_OEMBED_ENDPOINTS', {})
+OEMBED_RATE_LIMITS = getattr(settings, 'TUMBLELOG_OEMBED_RATE_LIMITS', {})
 TWITTER_LANGUAGE = getattr(settings, 'TUMBLELOG_TWITTER_LANGUAGE', 'en')
 TWITTER_WIDTH = getattr(settings, 'TUMBLELOG_TWITTER_WIDTH', 325)
 FLICKR_WIDTH = getattr(settings, 'TUMBLELOG_FLICKR_WIDTH', 640)
 SOUNDCLOUD_COLOR = getattr(settings, 'TUMBLELOG_SOUNDCLOUD_COLOR', '')
+CODE_HIGHLIGHTER = getattr(settings, 'TUMBLELOG_CODE_HIGHLIGHTER', \
+    'tumblelog.highlighting.pygments_highlighter')
+CODE_HIGHLIGHT_STYLE = getattr(settings, 'TUMBLELOG_CODE_HIGHLIGHT_STYLE', \
+    'default')
+IMAGE_WIDTHS = getattr(settings, 'TUMBLELOG_IMAGE_WIDTHS', \
+    (320, 640, 960, 1280, 1920))
+IMAGE_FORMATS = getattr(settings, 'TUMBLELOG_IMAGE_FORMATS', ('jpeg', 'webp'))
+IMAGE_QUALITY = getattr(settings, 'TUMBLELOG_IMAGE_QUALITY', 80)
+IMAGE_WORKERS = getattr(settings, 'TUMBLELOG_IMAGE_WORKERS', None)
+FILE_SENDFILE = getattr(settings, 'TUMBLELOG_FILE_SENDFILE', None)
+FILE_ACCEL_REDIRECT_PREFIX = getattr(settings, \
+    'TUMBLELOG_FILE_ACCEL_REDIRECT_PREFIX', '/protected/')
 TEXTFIELD_HELP_TEXT = _(getattr(settings, 'TUMBLELOG_TEXTFIELD_HELP_TEXT', ''))
 
 # RSS-related
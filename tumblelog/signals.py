@@ -0,0 +1,6 @@
+from django.dispatch import Signal
+
+# Sent once after a set-based update of many post type objects and their Post
+# objects (e.g. by the publish/draft admin actions), in place of the per-object
+# save signals. The sender is the post type model.
+posts_updated = Signal(providing_args=['object_ids', 'values'])
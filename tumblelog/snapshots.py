@@ -0,0 +1,78 @@
+from django.contrib.contenttypes.generic import GenericForeignKey
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Model
+from django.db.models.fields.files import FieldFile
+from django.db.models.manager import Manager
+from django.db.models.query import QuerySet
+from django.utils import simplejson
+from django.utils.safestring import SafeData, mark_safe
+
+
+class PostSnapshot(object):
+    """
+    Stand-in for a post type object, built from the snapshot stored on its
+    Post. Exposes each snapshotted value as an attribute, so templates may use
+    it in place of the post type object itself.
+    """
+
+    def __init__(self, data):
+        safe = data.pop('_safe', [])
+        for key, value in data.items():
+            if key in safe:
+                value = mark_safe(value)
+            elif isinstance(value, list):
+                value = [isinstance(item, dict) and PostSnapshot(item) or \
+                    item for item in value]
+            setattr(self, str(key), value)
+
+    def __unicode__(self):
+        return getattr(self, 'title', u'')
+
+
+def serialize_value(value):
+    "Converts a field value or property into a JSON-serializable value"
+    if isinstance(value, FieldFile):
+        return value.name or u''
+    if isinstance(value, Manager):
+        value = value.all()
+    if isinstance(value, (QuerySet, list, tuple)):
+        return [serialize_value(item) for item in value]
+    if isinstance(value, Model):
+        return dict((field.attname, serialize_value(getattr(value, \
+            field.attname))) for field in value._meta.fields)
+    return value
+
+
+def dumps(data):
+    """
+    Serializes a snapshot dictionary, recording which values are safe HTML so
+    that they may be marked safe again when loaded.
+    """
+    data = dict(data)
+    data['_safe'] = [key for key, value in data.items() if \
+        isinstance(value, SafeData)]
+    data = dict((key, serialize_value(value)) for key, value in data.items())
+    return simplejson.dumps(data, cls=DjangoJSONEncoder)
+
+
+def loads(snapshot):
+    "Returns a PostSnapshot for the passed serialized snapshot"
+    return PostSnapshot(simplejson.loads(snapshot))
+
+
+def attach_snapshots(model, objects):
+    """
+    Sets the value of each GenericForeignKey on the passed Post instances to a
+    PostSnapshot, without querying the database. Returns a list of the objects
+    that have no snapshot.
+    """
+    gfk_fields = [field for field in model._meta.virtual_fields if
+        isinstance(field, GenericForeignKey)]
+    missing = []
+    for obj in objects:
+        if not getattr(obj, 'snapshot', None):
+            missing.append(obj)
+            continue
+        for field in gfk_fields:
+            setattr(obj, field.cache_attr, loads(obj.snapshot))
+    return missing
@@ -1,10 +1,32 @@
 from django.conf.urls.defaults import *
+from django.views.decorators.http import condition
 
-from tumblelog.feeds import PostFeed
-from tumblelog.views import PostDetailView, PostListView
+from tumblelog.cache import cache_page
+from tumblelog.feeds import AtomPostFeed, JSONPostFeed, PostFeed
+from tumblelog.views import PostDetailView, PostListView, detail_etag, \
+    detail_last_modified, download, download_etag, download_last_modified, \
+    list_etag, list_last_modified
+
+# Conditional GET is handled before the page cache, so that a client with a
+# current copy is answered without fetching or rendering the page
+list_condition = condition(etag_func=list_etag, \
+    last_modified_func=list_last_modified)
+detail_condition = condition(etag_func=detail_etag, \
+    last_modified_func=detail_last_modified)
+download_condition = condition(etag_func=download_etag, \
+    last_modified_func=download_last_modified)
 
 urlpatterns = patterns('tumblelog.views',
-    url(r'^$', PostListView.as_view(), name="list"),
-    url(r'^feed/$', PostFeed(), name="feed"),
-    url(r'^(?P<slug>.+)/$', PostDetailView.as_view(), name="detail"),
+    url(r'^$', list_condition(cache_page(PostListView.as_view())), \
+        name="list"),
+    url(r'^feed/$', list_condition(cache_page(PostFeed())), name="feed"),
+    url(r'^feed/atom/$', list_condition(cache_page(AtomPostFeed())), \
+        name="atom_feed"),
+    url(r'^feed/json/$', list_condition(cache_page(JSONPostFeed())), \
+        name="json_feed"),
+    url(r'^(?P<slug>[^/]+)/download/$', download_condition(download), \
+        name="download"),
+    url(r'^(?P<slug>.+)/$', \
+        detail_condition(cache_page(PostDetailView.as_view())), \
+        name="detail"),
 )
@@ -1,4 +1,8 @@
+from contextlib import contextmanager
+
+from django.db import transaction
 from django.db.models import get_model
+from django.utils.importlib import import_module
 
 
 def import_model(path):
@@ -7,3 +11,25 @@ def import_model(path):
     """
     split = path.split('.', 1)
     return get_model(split[0], split[1])
+
+
+def import_attribute(path):
+    """
+    Passed a string "package.module.name", will return name from the module.
+    """
+    module, name = path.rsplit('.', 1)
+    return getattr(import_module(module), name)
+
+
+@contextmanager
+def atomic(using=None):
+    """
+    Runs the enclosed block in a transaction that is committed on success and
+    rolled back on error. If a transaction is already being managed (e.g. by
+    the admin's change views), the block joins it instead.
+    """
+    if transaction.is_managed(using=using):
+        yield
+    else:
+        with transaction.commit_on_success(using=using):
+            yield
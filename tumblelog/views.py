@@ -1,31 +1,118 @@
+import os
+import re
+import unicodedata
+import urllib
+from calendar import timegm
+
+from django.conf import settings
+from django.http import Http404, HttpResponse
+from django.template import Context
+from django.template.loader import render_to_string
+from django.utils.encoding import force_unicode
+from django.utils.http import http_date, urlquote
+from django.utils.translation import ugettext as _
 from django.views.generic.detail import DetailView
 from django.views.generic.list import ListView
 
-from tumblelog.models import Post
-from tumblelog.settings import POSTS_PER_PAGE
+from tumblelog.cache import get_fragments, get_list_validator
+from tumblelog.managers import public_filter
+from tumblelog.models import File, Post
+from tumblelog.pagination import CursorPaginator, InvalidCursor
+from tumblelog.settings import CACHE_FRAGMENTS, CURSOR_PAGINATION, \
+    FILE_ACCEL_REDIRECT_PREFIX, FILE_SENDFILE, POSTS_PER_PAGE, USE_SNAPSHOTS
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
 
+class FragmentCacheMixin(object):
+    """
+    With TUMBLELOG_CACHE_FRAGMENTS enabled, sets the rendered attribute of
+    each post to its cached tumblelog/post.html fragment. In the list view,
+    post type objects are only loaded for the posts missing from the cache;
+    the detail view always attaches its post's, which its page reads outside
+    the fragment.
+    """
+    fragment_mode = None
+
+    def get_post_queryset(self):
+        queryset = Post.objects.public()
+        if self.fragment_mode == 'list':
+            if CACHE_FRAGMENTS:
+                return queryset
+            if USE_SNAPSHOTS:
+                return queryset.select_snapshot()
+        elif CACHE_FRAGMENTS and USE_SNAPSHOTS:
+            # The detail page reads the post type's meta_description outside
+            # the cached fragment; the snapshot provides it without a query
+            return queryset.select_snapshot()
+        return queryset.select_generic_related()
+
+    def render_fragments(self, posts):
+        if not CACHE_FRAGMENTS:
+            return
+        posts = list(posts)
+        if not posts:
+            return
+        # Fragments are shared by every visitor, so they are rendered without
+        # the request's context processors; only the URLs the post templates
+        # use are passed
+        context = Context({
+            'list_view': self.fragment_mode == 'list',
+            'detail_view': self.fragment_mode == 'detail',
+            'MEDIA_URL': settings.MEDIA_URL,
+            'STATIC_URL': settings.STATIC_URL,
+        })
 
-class PostListView(ListView):
+        def render(post):
+            return render_to_string('tumblelog/post.html', {'post': post}, \
+                context_instance=context)
+
+        for post, fragment in zip(posts, get_fragments(posts, \
+            self.fragment_mode, render)):
+            post.rendered = fragment
+
+
+class PostListView(FragmentCacheMixin, ListView):
     context_object_name = 'posts'
     paginate_by = POSTS_PER_PAGE
+    fragment_mode = 'list'
 
     def get_queryset(self):
-        return Post.objects.public().select_generic_related()
+        return self.get_post_queryset()
+
+    def paginate_queryset(self, queryset, page_size):
+        """
+        With TUMBLELOG_CURSOR_PAGINATION enabled, paginates by seeking on the
+        ?cursor= parameter instead of counting and offsetting by ?page=.
+        """
+        if not CURSOR_PAGINATION:
+            return super(PostListView, self).paginate_queryset(queryset, \
+                page_size)
+        paginator = CursorPaginator(queryset, page_size)
+        try:
+            page = paginator.page(self.request.GET.get('cursor'))
+        except InvalidCursor:
+            raise Http404(_(u'Invalid page cursor.'))
+        return (paginator, page, page.object_list, page.has_other_pages())
 
     def get_context_data(self, **kwargs):
         context = super(PostListView, self).get_context_data(**kwargs)
         context.update({
             'list_view': True,
             'detail_view': False,
+            'cursor_pagination': CURSOR_PAGINATION,
         })
+        self.render_fragments(context['object_list'])
         return context
 
 
-class PostDetailView(DetailView):
+class PostDetailView(FragmentCacheMixin, DetailView):
     context_object_name = 'post'
+    fragment_mode = 'detail'
 
     def get_queryset(self):
-        return Post.objects.public().select_generic_related()
+        return self.get_post_queryset()
 
     def get_context_data(self, **kwargs):
         context = super(PostDetailView, self).get_context_data(**kwargs)
@@ -33,4 +120,202 @@ class PostDetailView(DetailView):
             'list_view': False,
             'detail_view': True,
         })
+        self.render_fragments([self.object])
         return context
+
+
+def public_posts_validator(request, *args, **kwargs):
+    """
+    Returns the cache generation, the time it was last bumped and the latest
+    publication date of any public post, usually from the cache. Any change
+    to the posts shown in the listing views or feeds changes at least one of
+    these, including a scheduled post becoming public.
+    """
+    if not hasattr(request, '_tumblelog_validator'):
+        request._tumblelog_validator = get_list_validator()
+    return request._tumblelog_validator
+
+
+def post_validator(request, slug=None, *args, **kwargs):
+    """
+    Returns the modification and publication dates of the public post with
+    the passed slug, or None if there is no such post.
+    """
+    if not hasattr(request, '_tumblelog_validator'):
+        posts = Post.objects.public().filter(slug=slug) \
+            .values('date_modified', 'date_published')
+        request._tumblelog_validator = posts and posts[0] or None
+    return request._tumblelog_validator
+
+
+def last_modified(validator, keys=('date_modified', 'date_published')):
+    dates = [validator[key] for key in keys if validator.get(key)]
+    return dates and max(dates) or None
+
+
+def list_etag(request, *args, **kwargs):
+    "ETag of the post listing views and feeds"
+    validator = public_posts_validator(request)
+    return '%s-%s' % (
+        validator['generation'],
+        validator['date_published'] and \
+            validator['date_published'].strftime('%Y%m%d%H%M%S%f'),
+    )
+
+
+def list_last_modified(request, *args, **kwargs):
+    """
+    Last-Modified date of the post listing views and feeds: the later of the
+    last change to any post and the latest publication, so that it moves
+    forward when a post is unpublished or deleted, too.
+    """
+    return last_modified(public_posts_validator(request), \
+        ('date_changed', 'date_published'))
+
+
+def detail_etag(request, *args, **kwargs):
+    "ETag of the post detail view"
+    validator = post_validator(request, *args, **kwargs)
+    if validator is None:
+        return None
+    return validator['date_modified'].strftime('%Y%m%d%H%M%S%f')
+
+
+def detail_last_modified(request, *args, **kwargs):
+    "Last-Modified date of the post detail view"
+    validator = post_validator(request, *args, **kwargs)
+    return validator and last_modified(validator) or None
+
+
+def file_validator(request, slug=None, *args, **kwargs):
+    """
+    Returns the public File post with the passed slug, or None if there is no
+    such post. It is loaded once per request.
+    """
+    if not hasattr(request, '_tumblelog_file'):
+        files = File.objects.filter(public_filter(), slug=slug)[:1]
+        request._tumblelog_file = files and files[0] or None
+    return request._tumblelog_file
+
+
+def download_etag(request, *args, **kwargs):
+    "ETag of a file download: the hash of the file's content"
+    obj = file_validator(request, *args, **kwargs)
+    return obj and obj.content_hash or None
+
+
+def download_last_modified(request, *args, **kwargs):
+    "Last-Modified date of a file download"
+    obj = file_validator(request, *args, **kwargs)
+    return obj and obj.date_modified or None
+
+
+def parse_range(header, size):
+    """
+    Returns the first and last byte positions of the single byte range in the
+    passed Range header, or None if the header should be ignored (i.e. it is
+    malformed or requests multiple ranges). The first position is beyond the
+    end of the file if the range cannot be satisfied.
+    """
+    match = RANGE_RE.match(header.strip())
+    if not match or not any(match.groups()):
+        return None
+    first, last = match.groups()
+    if not first:
+        # A suffix range, e.g. bytes=-500 for the last 500 bytes
+        if not int(last):
+            return (size, size)
+        return (max(0, size - int(last)), size - 1)
+    start = int(first)
+    if start >= size:
+        return (start, start)
+    end = int(last) if last else size - 1
+    if end < start:
+        return None
+    return (start, min(end, size - 1))
+
+
+def read_file(field_file, start, length):
+    "Yields length bytes of the passed file, starting at start, in chunks"
+    field_file.open('rb')
+    try:
+        field_file.seek(start)
+        while length > 0:
+            chunk = field_file.read(min(DOWNLOAD_CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+    finally:
+        field_file.close()
+
+
+def content_disposition(filename):
+    """
+    Returns a Content-Disposition header value for downloading the named
+    file. Header values must be ASCII, so the name is given both as an ASCII
+    fallback and, per RFC 5987, as UTF-8.
+    """
+    filename = force_unicode(filename)
+    fallback = unicodedata.normalize('NFKD', filename).encode('ascii', \
+        'ignore').replace('"', '').replace('\\', '')
+    return 'attachment; filename="%s"; filename*=UTF-8\'\'%s' % (
+        fallback or 'download',
+        urllib.quote(filename.encode('utf-8'), safe=''),
+    )
+
+
+def download(request, slug):
+    """
+    Serves the file of a public File post, using the size, content type and
+    hash stored when it was uploaded. Single byte ranges are served as partial
+    content. With TUMBLELOG_FILE_SENDFILE set, the file is sent by the web
+    server instead, which also serves any ranges.
+    """
+    obj = file_validator(request, slug)
+    if obj is None or not obj.file_file:
+        raise Http404(_(u'No file found matching the query'))
+    name = obj.file_file.name
+    content_type = obj.content_type or 'application/octet-stream'
+
+    if FILE_SENDFILE:
+        response = HttpResponse('', content_type=content_type)
+        if FILE_SENDFILE == 'x-accel-redirect':
+            response['X-Accel-Redirect'] = '%s%s' % (
+                FILE_ACCEL_REDIRECT_PREFIX,
+                urlquote(name),
+            )
+        else:
+            # Quoted, as header values must be ASCII; mod_xsendfile unescapes
+            # the path
+            response['X-Sendfile'] = urlquote(obj.file_file.path)
+    else:
+        size = obj.file_size
+        if size is None:
+            size = obj.file_file.size
+        byte_range = None
+        if_range = request.META.get('HTTP_IF_RANGE')
+        if 'HTTP_RANGE' in request.META and (not if_range or if_range in (
+            '"%s"' % obj.content_hash,
+            http_date(timegm(obj.date_modified.utctimetuple())),
+        )):
+            byte_range = parse_range(request.META['HTTP_RANGE'], size)
+
+        if byte_range is None:
+            response = HttpResponse(read_file(obj.file_file, 0, size), \
+                content_type=content_type)
+            response['Content-Length'] = str(size)
+        elif byte_range[0] >= size:
+            response = HttpResponse('', content_type=content_type, status=416)
+            response['Content-Range'] = 'bytes */%d' % size
+        else:
+            start, end = byte_range
+            response = HttpResponse(read_file(obj.file_file, start, \
+                end - start + 1), content_type=content_type, status=206)
+            response['Content-Range'] = 'bytes %d-%d/%d' % (start, end, size)
+            response['Content-Length'] = str(end - start + 1)
+        response['Accept-Ranges'] = 'bytes'
+
+    response['Content-Disposition'] = content_disposition(
+        os.path.basename(name))
+    return response